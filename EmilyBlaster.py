@@ -10,20 +10,32 @@
 # Imports
 
 # Standard library imports
+import bisect
 import math
 import random
 import sys
 
 # Third party imports
+import numpy as np
 import pygame
 
 # Local imports
 import anim
+import assets
+import bench
+import collision
 import fonts
+import gametime
+import hud
+import render
 import screen_setup
 from anim import AnimSprite
+from bullets import BulletSystem
+from hud import HUD, FPSWidget, Widget
 from message import Message
 from nineslice import NineSlice
+from pool import PooledSprite, SpritePool
+from prefetch import Prefetcher
 from screen_setup import screen_scale
 
 
@@ -56,10 +68,36 @@ BULLET_WIDTH = 9
 BULLET_HEIGHT = 13
 BULLET_SPEED = 10
 
+# At most MAX_BULLETS can be in flight; shots past that are dropped. Shots
+# closer together than MIN_SHOT_INTERVAL seconds are dropped too; 0 means
+# there's no rate limit.
+MAX_BULLETS = 64
+MIN_SHOT_INTERVAL = 0
+
+# Splats are recycled once this many are on screen. Their random rotations
+# are rounded to multiples of BLOTCH_ANGLE_STEP so they can be prebuilt.
+MAX_BLOTCHES = 64
+BLOTCH_MAX_ANGLE = 50
+BLOTCH_ANGLE_STEP = 5
+
+# Word tiles are only created this many seconds before they start moving
+# along their path.
+TILE_SPAWN_LEAD = 0.25
+
 ENEMY_WIDTH = 40
 ENEMY_HEIGHT = 20
 NUM_ENEMIES = 8
 
+# The game state advances in steps of SIM_STEP_MS; speeds given in pixels
+# are per step. A slow frame runs at most MAX_SIM_STEPS_PER_FRAME steps,
+# times the --time-scale if there is one.
+SIM_HZ = 60
+SIM_STEP_MS = 1000 / SIM_HZ
+MAX_SIM_STEPS_PER_FRAME = 5
+
+# Time per frame spent preparing the next quatrain between quatrains.
+PREFETCH_BUDGET_MS = 2
+
 # Constants for deadzone and axis indices
 DEADZONE = 0.2  # Adjust the deadzone as needed
 AXIS_LEFT_X = 0
@@ -106,21 +144,20 @@ def debug_print(*s):
 def render_outlined_text(s):
     '''Render text s to a new surface, outlined in white.'''
 
-    # Render the text to get the size.
-    text_surface = main_font.render(s, False, BLUE)
-    width, height = text_surface.get_size()
+    # Measure the text to get the size.
+    width, height = fonts.measure(main_font, s)
 
     # Create a new surface with a transparent background.
     surface = pygame.Surface((width + 2, height + 2), pygame.SRCALPHA)
 
     # Render the white outline.
     offsets = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    outline_atlas = fonts.get_atlas(main_font, WHITE)
     for dx, dy in offsets:
-        outline_surface = main_font.render(s, False, WHITE)
-        surface.blit(outline_surface, (dx + 1, dy + 1))
+        outline_atlas.draw(surface, s, (dx + 1, dy + 1))
 
     # Render the text on top.
-    surface.blit(text_surface, (1, 1))
+    fonts.get_atlas(main_font, BLUE).draw(surface, s, (1, 1))
 
     return surface
 
@@ -129,6 +166,8 @@ def render_outlined_text(s):
 # Initialization
 
 # Initialize pygame
+if bench.is_active:
+    bench.init()
 pygame.init()
 pygame.joystick.init()
 joystick = None
@@ -146,19 +185,34 @@ pygame.mixer.init()
 BULLET_SPEED = screen_scale(BULLET_SPEED)
 PLAYER_SPEED = screen_scale(PLAYER_SPEED)
 
+# Input comes from the keyboard and joystick, or from a script when we're
+# benchmarking.
+get_pressed_keys = pygame.key.get_pressed
+scripted_input = None
+if bench.is_active:
+    scripted_input = bench.ScriptedInput()
+    get_pressed_keys = scripted_input.get_pressed
+
+# Per-frame timing; this only records anything in benchmark mode.
+frame_timer = bench.FrameTimer(enabled=bench.is_active)
+
+# Gameplay runs in fixed steps, whatever the frame rate is.
+timestep = gametime.FixedTimestep(
+        SIM_STEP_MS, MAX_SIM_STEPS_PER_FRAME, start_ms=gametime.get_ticks()
+)
+render_fps = gametime.fps_arg or (bench.BENCH_FPS if bench.is_active else 60)
+
 # Font initialization
 fonts.init()
 main_font, nice_font = fonts.main_font, fonts.nice_font
 
-# Clock for FPS control
-clock = pygame.time.Clock()
-
 # Load and scale background image
-background_image = pygame.image.load('tombstone_bg.png')
+background_image = assets.load_image('tombstone_bg.png', has_alpha=False)
 bg_width, bg_height = background_image.get_size()
 scale_factor = max(screen_w / bg_width, screen_h / bg_height)
-new_size = (int(bg_width * scale_factor), int(bg_height * scale_factor))
-background_image = pygame.transform.scale(background_image, new_size)
+background_image = assets.load_image(
+        'tombstone_bg.png', scale_factor, has_alpha=False
+)
 
 # Load sound effects
 splat = pygame.mixer.Sound('splat2.wav')
@@ -174,8 +228,7 @@ plus_5 = render_outlined_text('+5')
 class Player(pygame.sprite.Sprite):
     def __init__(self):
         super().__init__()
-        self.image = pygame.image.load('quill.png').convert_alpha()
-        self.image = pygame.transform.scale_by(self.image, 1.2 * scale_up)
+        self.image = assets.load_image('quill.png', 1.2 * scale_up)
         # self.image = pygame.Surface((PLAYER_WIDTH, PLAYER_HEIGHT))
         # self.image.fill(GREEN)
         self.rect = self.image.get_rect()
@@ -190,12 +243,16 @@ class Player(pygame.sprite.Sprite):
         self.min_x = -70
         self.max_x = screen_w + 10
 
+        # Where the player was after the previous step, for drawing.
+        self.prev_rect = self.rect.copy()
+
     def update(self):
 
+        self.prev_rect.topleft = self.rect.topleft
         if game_mode != 'playing':
             return
 
-        keys = pygame.key.get_pressed()
+        keys = get_pressed_keys()
         self.speed_x = 0
 
         # They can play with either the joystick or the keyboard.
@@ -218,57 +275,87 @@ class Player(pygame.sprite.Sprite):
             self.rect.right = self.max_x
 
 # Bullet class
-class Bullet(pygame.sprite.Sprite):
-    def __init__(self, x, y):
-        super().__init__()
+class Bullet(PooledSprite):
+    """ Bullets belong to bullet_system, which moves them and returns them
+        to its pool when they're killed. All of them share one image, made by
+        make_template().
+    """
+
+    template = None
+
+    @classmethod
+    def make_template(cls):
         w, h = screen_scale(BULLET_WIDTH), screen_scale(BULLET_HEIGHT)
-        self.image = pygame.Surface((w, h), pygame.SRCALPHA)
-        
+        image = pygame.Surface((w, h), pygame.SRCALPHA)
+
         pad    = screen_scale(2)
         radius = screen_scale(3)
         pygame.draw.rect(
-                self.image, WHITE,
+                image, WHITE,
                 (0, 0, w, h),
                 border_radius=radius
         )
         pygame.draw.rect(
-                self.image, BLACK,
+                image, BLACK,
                 (pad, pad, w - 2 * pad, h - 2 * pad),
                 border_radius=radius
         )
+        cls.template = image.convert_alpha()
 
+    def __init__(self):
+        super().__init__()
+        self.image = self.template
         self.rect = self.image.get_rect()
-        self.rect.centerx = x
-        self.rect.bottom = y
-        self.speed_y = -BULLET_SPEED
 
-    def update(self):
-        self.rect.y += self.speed_y
-        if self.rect.bottom < 0:
-            self.kill()
+class Blotch(PooledSprite):
+    """ An ink splat left where a bullet hit. Blotches come from
+        blotch_pool, and return to it once they've faded out.
+    """
+
+    duration = 0.5  # In seconds.
+
+    # Maps a rotation angle to a shared, pre-rotated image; see make_variants().
+    variants = {}
 
-class Blotch(pygame.sprite.Sprite):
-    def __init__(self, x, y):
-        ''' x, y are the center coordinates. '''
+    @classmethod
+    def make_variants(cls):
+        base = assets.load_image('ink_blotch_2.png', scale_up)
+        for angle in range(-BLOTCH_MAX_ANGLE, BLOTCH_MAX_ANGLE + 1,
+                           BLOTCH_ANGLE_STEP):
+            cls.variants[angle] = pygame.transform.rotate(base, angle)
+
+    def __init__(self):
         super().__init__()
-        self.image = pygame.image.load('ink_blotch_2.png')
-        self.image = pygame.transform.scale_by(self.image, scale_up)
-        self.image = pygame.transform.rotate(
-                self.image, random.randint(-50, 50)
-        )
+        # The variants are shared, so each blotch draws its current one into
+        # its own canvas, where it's ok to change the alpha.
+        w = max(v.get_width()  for v in self.variants.values())
+        h = max(v.get_height() for v in self.variants.values())
+        self._canvas = pygame.Surface((w, h), pygame.SRCALPHA).convert_alpha()
+
+    def reset(self, x, y):
+        """ x, y are the center coordinates. """
+        angle = random.randint(-BLOTCH_MAX_ANGLE, BLOTCH_MAX_ANGLE)
+        angle = round(angle / BLOTCH_ANGLE_STEP) * BLOTCH_ANGLE_STEP
+        variant = self.variants[angle]
+
+        # A normal blit would blend; this copies the pixels exactly.
+        self._canvas.fill((0, 0, 0, 0))
+        self._canvas.blit(variant, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+        self.image = self._canvas.subsurface(variant.get_rect())
         self.rect = self.image.get_rect()
         self.rect.centerx = x
         self.rect.centery = y
-        self.start = pygame.time.get_ticks()
-        self.last_t = self.start
+        self.start = gametime.get_ticks()
 
     def update(self):
 
-        blotch_duration = 0.5
-        now = pygame.time.get_ticks()
+        now = gametime.get_ticks()
 
         # age goes from 0 up to 1 and stops at 1.
-        age = min(1, (now - self.start) / 1000 / blotch_duration)
+        age = min(1, (now - self.start) / 1000 / self.duration)
+        if age == 1:
+            self.kill()
+            return
         alpha = 255 * (1 - age)
         self.image.set_alpha(alpha)
 
@@ -277,9 +364,14 @@ class Blotch(pygame.sprite.Sprite):
 
 # A class to assist with word tile movements
 class WordPaths:
-    def __init__(self, poem):
+    ''' The paths word tiles follow for one quatrain. Constructing this only
+        lays out the paths, so it can be done ahead of time; call start()
+        when the quatrain begins to set the tiles moving.
+    '''
+
+    def __init__(self, poem, quatrain_num):
         self.speed = screen_scale(300)  # This is in pixels per second.
-        self.speed *= 1.1 ** (current_quatrain - 1)
+        self.speed *= 1.1 ** (quatrain_num - 1)
 
         self.poem = poem
         self.substrings = get_substrings_of_text(poem)
@@ -287,26 +379,36 @@ class WordPaths:
         # Determine the path metrics.
         widest_tile = self._compute_widest_tile()
         row_skip = (screen_h - TOP_MARGIN - BOTTOM_MARGIN) // 11
+        self.row_skip = row_skip  # Also used as the collision band height.
         top_path_y = TOP_MARGIN + row_skip // 2
         self._determine_paths(widest_tile, row_skip, top_path_y)
 
+    def start(self):
+        ''' Start the tiles on their paths as of the current time. '''
         # Compute where each tile should begin.
         self._initialize_tile_positions()
 
+        # Set up the arrays used by get_all_tile_pos().
+        self._build_tile_arrays()
+
+        # Tiles are created as they're needed; see pop_due_tiles().
+        self._init_pending_tiles()
+
     def _compute_widest_tile(self):
         self.tile_offsets = []
         self.tile_widths  = []
         widest = 0
         for s in self.substrings:
-            e = Enemy(0, 0, 0, s)
-            r = e.image.get_rect()
-            self.tile_offsets.append((-r.width // 2, -r.height // 2))
-            self.tile_widths.append(r.width)
-            widest = max(widest, r.width)
+            w, h = Enemy.get_size(s)
+            self.tile_offsets.append((-w // 2, -h // 2))
+            self.tile_widths.append(w)
+            widest = max(widest, w)
         return widest
 
     def _determine_paths(self, widest_tile, row_skip, top_path_y):
         self.paths = []
+        self.path_dists = []  # Per path, the distance along it to each point.
+        self.path_dirs  = []  # Per path, the unit direction of each segment.
         scr_w = screen_w
         w = widest_tile // 2
         for path_idx in range(2):
@@ -342,25 +444,117 @@ class WordPaths:
                 y += 3 * row_skip
             self.paths.append(path)
             # print(f'path {path_idx}:', path)
+            self._add_arc_lengths(path)
+
+    def _add_arc_lengths(self, path):
+        ''' Append the cumulative distances and segment directions of `path`
+            to self.path_dists and self.path_dirs. These let get_tile_pos()
+            find a tile's segment with a binary search.
+        '''
+        dists = [0]
+        dirs  = []
+        for (x1, y1), (x2, y2) in zip(path, path[1:]):
+            dist = math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+            dists.append(dists[-1] + dist)
+            dirs.append(((x2 - x1) / dist, (y2 - y1) / dist) if dist else (0, 0))
+        self.path_dists.append(dists)
+        self.path_dirs.append(dirs)
 
     def _initialize_tile_positions(self):
         ''' This will set up the self.tile_start[] list. '''
+        init_time = gametime.get_ticks() / 1000 * self.speed
+        self.tile_start = self._get_tile_starts(init_time)
+
+    def _get_tile_starts(self, init_time):
+        ''' Return each tile's starting distance along its path, given that
+            the paths start at distance `init_time`.
+        '''
         pad = 60
-        self.tile_start = []
-        init_time = pygame.time.get_ticks() / 1000 * self.speed
+        tile_start = []
         t = [-init_time, -init_time]
         prev_w = [0, 0]
         for i, width in enumerate(self.tile_widths):
             idx = i % 2
             s = t[idx] - (prev_w[idx] + width) // 2 - pad
-            self.tile_start.append(s)
+            tile_start.append(s)
             t[idx] = s
             prev_w[idx] = width
+        return tile_start
+
+    def get_spawn_order(self):
+        ''' Return the tile indexes in the order start() will spawn them.
+            This doesn't depend on the start time, so it works before start().
+        '''
+        tile_start = self._get_tile_starts(0)
+        return sorted(range(len(tile_start)), key=lambda i: -tile_start[i])
+
+    def _init_pending_tiles(self):
+        ''' Set up self.pending, a list of (spawn_time, tile_idx) in the order
+            tiles should be created. A tile starts moving once
+            tile_start + speed * t reaches 0, and is spawned TILE_SPAWN_LEAD
+            seconds before that; until then it would sit still off screen.
+        '''
+        self.pending = sorted(
+                ((-start / self.speed - TILE_SPAWN_LEAD) * 1000, i)
+                for i, start in enumerate(self.tile_start)
+        )
+        self.pending.reverse()  # So the next tile is popped from the end.
+
+    def pop_due_tiles(self, t):
+        ''' Return the indexes of tiles that should be created by time `t`,
+            and take them off the pending list.
+        '''
+        due = []
+        while self.pending and self.pending[-1][0] <= t:
+            due.append(self.pending.pop()[1])
+        return due
+
+    def _build_tile_arrays(self):
+        n = len(self.tile_start)
+        self._tile_start = np.array(self.tile_start, dtype=np.float64)
+        self._tile_dx = np.array([dx for dx, _ in self.tile_offsets], np.float64)
+        self._tile_dy = np.array([dy for _, dy in self.tile_offsets], np.float64)
+        self._path_tiles = [np.arange(path_idx, n, 2) for path_idx in range(2)]
+        self._path_arrays = [
+                (
+                    np.array(self.path_dists[path_idx], dtype=np.float64),
+                    np.array(self.paths[path_idx],      dtype=np.float64),
+                    np.array(self.path_dirs[path_idx],  dtype=np.float64)
+                )
+                for path_idx in range(2)
+        ]
+        self._all_pos_t = None
+        self._all_pos = (np.zeros(n), np.zeros(n), np.zeros(n, dtype=bool))
+
+    def get_all_tile_pos(self, t):
+        ''' This returns (xs, ys, is_done) as NumPy arrays indexed by tile
+            index; element i matches what get_tile_pos(i, t) returns. The
+            result is cached, so calling this for every tile within the same
+            frame only does the work once.
+        '''
+        if t == self._all_pos_t:
+            return self._all_pos
+        xs, ys, is_done = self._all_pos
+        pos = np.maximum(0, self._tile_start + t / 1000 * self.speed)
+        for path_idx, tiles in enumerate(self._path_tiles):
+            dists, points, dirs = self._path_arrays[path_idx]
+            p = pos[tiles]
+            seg = np.searchsorted(dists, p, side='right') - 1
+            done = seg >= len(dirs)
+            seg = np.minimum(seg, len(dirs) - 1)
+            along = np.where(done, 0, p - dists[seg])
+            # Finished tiles sit at the path's final endpoint.
+            start = np.where(done[:, None], points[-1], points[seg])
+            xs[tiles] = start[:, 0] + dirs[seg, 0] * along + self._tile_dx[tiles]
+            ys[tiles] = start[:, 1] + dirs[seg, 1] * along + self._tile_dy[tiles]
+            is_done[tiles] = done
+        self._all_pos_t = t
+        return self._all_pos
 
     def get_tile_pos(self, tile_idx, t):
         ''' This returns (x, y, is_done) for the given tile at time `t`;
             the time is expected to be measured in milliseconds, as is returned
-            by pygame.time.get_ticks(). x, y are the assigned top-left
+            by gametime.get_ticks(). x, y are the assigned top-left
             coordinates of the given tile. is_done is True as soon as the tile
             has reached its final position, and remains True thereafter.
         '''
@@ -372,19 +566,19 @@ class WordPaths:
                 print('speed-adjusted time:', t / 1000 * self.speed)
                 print('raw pos:', self.tile_start[tile_idx] + t / 1000 * self.speed)
                 print('pos', pos)
-        d    = 0
-        path = self.paths[tile_idx % 2]
-        x, y = path[0]
+        path_idx = tile_idx % 2
+        path  = self.paths[path_idx]
+        dists = self.path_dists[path_idx]
         dx, dy = self.tile_offsets[tile_idx]  # To move from center to topleft.
-        for x2, y2 in path[1:]:
-            dist = math.sqrt((x2 - x) ** 2 + (y2 - y) ** 2)
-            if d + dist > pos:
-                perc = (pos - d) / dist
-                x += (x2 - x) * perc
-                y += (y2 - y) * perc
-                return x + dx, y + dy, False
-            d += dist
-            x, y = x2, y2
+
+        # Find i so that dists[i] <= pos < dists[i + 1].
+        i = bisect.bisect_right(dists, pos) - 1
+        if i < len(path) - 1:
+            x, y = path[i]
+            ux, uy = self.path_dirs[path_idx][i]
+            along = pos - dists[i]
+            return x + ux * along + dx, y + uy * along + dy, False
+
         # If we get here, then the tile is off the screen.
         # We'll return the path's final endpoint.
         x, y = path[-1]
@@ -395,46 +589,84 @@ class Enemy(pygame.sprite.Sprite):
     def __init__(self, x, y, tile_idx, s):
         super().__init__()
         self.tile_idx = tile_idx
-        bg_nineslice = NineSlice('word_box_6.png', (52, 27), (55, 29), scale_up)
-        text_surface = main_font.render(s, True, (80, 60, 30))
-        text_w, text_h = text_surface.get_width(), text_surface.get_height()
-        pad_w, pad_h = screen_scale(40), screen_scale(25)
-        w = max(text_w + pad_w, bg_nineslice.minwidth)
-        h = max(text_h + pad_h, bg_nineslice.minheight)
-        self.image = pygame.Surface((w, h), pygame.SRCALPHA)
-        bg_nineslice.draw(self.image, 0, 0, w, h)
-        self.image.blit(text_surface, ((w - text_w) // 2, (h - text_h) // 2))
+        w, h = self.get_size(s)
+        label_atlas = self._get_label_atlas()
+        text_w, text_h = label_atlas.measure(s)
+        self.image = self._get_nineslice().render(w, h).copy()
+        label_atlas.draw(self.image, s, ((w - text_w) // 2, (h - text_h) // 2))
         self.flashy = AnimSprite(self.image)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
+        # Where the tile was on the previous frame, for swept collisions.
+        self.prev_rect = self.rect.copy()
         self.is_next = False
 
         # self.flashy = AnimSprite(self.image)
         # self.flashy.start_flashing()
 
+    @staticmethod
+    def _get_nineslice():
+        return NineSlice.get('word_box_6.png', (52, 27), (55, 29), scale_up)
+
+    @staticmethod
+    def _get_label_atlas():
+        return fonts.get_atlas(main_font, (80, 60, 30), antialias=True)
+
+    @classmethod
+    def prepare(cls, s):
+        ''' Render and cache the background of the tile for word `s`. '''
+        cls._get_nineslice().render(*cls.get_size(s))
+
+    @classmethod
+    def get_size(cls, s):
+        ''' Return the (w, h) of the tile for word `s`, without rendering. '''
+        bg_nineslice = cls._get_nineslice()
+        text_w, text_h = cls._get_label_atlas().measure(s)
+        pad_w, pad_h = screen_scale(40), screen_scale(25)
+        w = max(text_w + pad_w, bg_nineslice.minwidth)
+        h = max(text_h + pad_h, bg_nineslice.minheight)
+        return w, h
+
     def make_next(self):
         self.is_next = True
         self.flashy.start_flashing()
 
     def update(self):
-        t = pygame.time.get_ticks()
-        x, y, is_done = word_paths.get_tile_pos(self.tile_idx, t)
-        self.rect.x = x
-        self.rect.y = y
+        t = timestep.sim_ms
+        xs, ys, is_done = word_paths.get_all_tile_pos(t)
+        self.prev_rect.topleft = self.rect.topleft
+        self.rect.x = xs[self.tile_idx]
+        self.rect.y = ys[self.tile_idx]
         self.image = self.flashy.image
-        if is_done:
+        if is_done[self.tile_idx]:
             del tiles_by_idx[self.tile_idx]
             if self.is_next:
                 update_next_word()
             self.kill()
 
 def update_next_word():
-    """Find and mark the next word tile as the next target."""
-    if len(tiles_by_idx) == 0:
+    """Find and mark the next word tile as the next target. If that tile
+       hasn't been spawned yet, spawn_due_tiles() marks it when it is.
+    """
+    global next_word_idx
+    remaining = list(tiles_by_idx) + [i for _, i in word_paths.pending]
+    if len(remaining) == 0:
         return
-    next_enemy = min(tiles_by_idx.values(), key=lambda enemy: enemy.tile_idx)
-    next_enemy.make_next()
+    next_word_idx = min(remaining)
+    if next_word_idx in tiles_by_idx:
+        tiles_by_idx[next_word_idx].make_next()
+
+def spawn_due_tiles(t):
+    """Create the word tiles that are about to start moving at time `t`."""
+    for i in word_paths.pop_due_tiles(t):
+        x, y, _ = word_paths.get_tile_pos(i, t)
+        enemy = Enemy(x, y, i, word_paths.substrings[i])
+        enemies.add(enemy)
+        all_sprites.add(enemy)
+        tiles_by_idx[i] = enemy
+        if i == next_word_idx:
+            enemy.make_next()
 
 def get_substrings_of_text(text, do_include_newlines=False):
     split = []
@@ -462,10 +694,9 @@ class Poem(pygame.sprite.Sprite):
         self.interline_skip = screen_scale(16)
         p = self.padding = screen_scale(10)
 
-        # Quietly render the text just to learn the sizing.
-        self.n = n = len(get_substrings_of_text(poem))
-        buff = pygame.Surface((0, 0), pygame.SRCALPHA)
-        self.render_rich_text(buff, poem, [WHITE] * n, 255, (0, 0), do_blit=False)
+        # Lay out the words once; this also learns the sizing.
+        self._layout_words(poem)
+        n = self.n
         w, h = self.text_w, self.text_h
         w, h = w + 2 * p, h + 2 * p
 
@@ -474,9 +705,9 @@ class Poem(pygame.sprite.Sprite):
         # Initially render to a buffer image that we can make translucent.
         buff = pygame.Surface((w, h), pygame.SRCALPHA)
         pygame.draw.rect(buff, (128, 128, 128, 70), (0, 0, w, h), border_radius=p)
-        self.render_rich_text(buff, poem, [BLACK] * n, 255, (p + 2, p    ))
-        self.render_rich_text(buff, poem, [WHITE] * n, 255, (p    , p + 2))
-        self.render_rich_text(buff, poem, [GRAY]  * n, 255, (p + 1, p + 1))
+        self.render_rich_text(buff, [BLACK] * n, (p + 2, p    ))
+        self.render_rich_text(buff, [WHITE] * n, (p    , p + 2))
+        self.render_rich_text(buff, [GRAY]  * n, (p + 1, p + 1))
         buff.set_alpha(140)
 
         self.image.blit(buff, (0, 0))
@@ -493,30 +724,46 @@ class Poem(pygame.sprite.Sprite):
         text_rect = text_surface.get_rect(topleft=pos)
         self.image.blit(text_surface, text_rect)
 
-    def render_rich_text(
-            self, dst, text, word_colors, alpha, position, do_blit=True):
-        lines = [line for line in text.split('\n') if len(line.strip()) > 0]
-        w_idx = 0
-        pos = list(position)
+    def _layout_words(self, text):
+        ''' Find where each word goes, relative to the top-left of the text.
+            This sets self.words, self.n, self.word_rects, self.text_w and
+            self.text_h. Nothing is drawn here; words are measured with the
+            glyph atlas.
+        '''
+        self.words = []
+        self.word_rects = []
+        pos = [0, 0]
         w, h = 0, 0
         for word in get_substrings_of_text(text, True):
             if word != '\n':
-                color = word_colors[w_idx]
-                text_surface = main_font.render(word, False, color)
-                text_surface.set_alpha(alpha)
-                text_rect = text_surface.get_rect(topleft=pos)
-                if do_blit and (color != TRANSPARENT):
-                    dst.blit(text_surface, text_rect)
-                w_idx += 1
-                w = max(w, pos[0] + text_surface.get_width())
-                pos[0] += text_surface.get_width() + 10
+                word_w, word_h = fonts.measure(main_font, word)
+                self.words.append(word)
+                self.word_rects.append(pygame.Rect(pos, (word_w, word_h)))
+                w = max(w, pos[0] + word_w)
+                pos[0] += word_w + 10
             else:
-                h = max(h, pos[1] + text_surface.get_height())
-                pos[0] = position[0]
-                pos[1] += text_surface.get_height() + self.interline_skip
+                h = max(h, pos[1] + word_h)
+                pos[0] = 0
+                pos[1] += word_h + self.interline_skip
+        self.n = len(self.words)
         self.text_w = w
         self.text_h = h
 
+    def render_rich_text(self, dst, word_colors, position):
+        for word, word_rect, color in zip(
+                self.words, self.word_rects, word_colors):
+            if color == TRANSPARENT:
+                continue
+            fonts.get_atlas(main_font, color).draw(
+                    dst, word, word_rect.move(position).topleft
+            )
+
+    def get_word_rect(self, word_idx):
+        ''' Return the screen rect covering every embossed copy of a word. '''
+        p = self.padding
+        word_rect = self.word_rects[word_idx].move(self.rect.x + p, self.rect.y + p)
+        return word_rect.inflate(2, 2).move(1, 1)
+
     def render_multiline_text(self, text, color, alpha, position):
         lines = text.split('\n')
         y_offset = 0
@@ -532,23 +779,23 @@ class Poem(pygame.sprite.Sprite):
         lines = text.split('\n')
         w, h = 2, 2  # Start height at 2 to account for embossing offsets.
         for i, line in enumerate(lines):
-            text_surface = main_font.render(line, False, WHITE)
-            w = max(w, text_surface.get_width() + 2)
-            h += text_surface.get_height()
+            line_w, line_h = fonts.measure(main_font, line)
+            w = max(w, line_w + 2)
+            h += line_h
             if i > 0:
                 h += self.interline_skip
         return w, h
 
     def highlight_word_idx(self, word_idx):
+        ''' Redraw just the given word in its highlighted colors. '''
         main_color = (200, 190, 185)
+        word = self.words[word_idx]
+        dx, dy = self.word_rects[word_idx].topleft
+        p = self.padding
         for i, w_color in enumerate([BLACK, BLACK, main_color]):
             j = (i + 2) % 3
-            word_colors = [TRANSPARENT] * self.n
-            word_colors[word_idx] = w_color
-            p = self.padding
-            x, y = p + j, p + 2 - j
-            self.render_rich_text(
-                    self.image, self.poem, word_colors, 255, (x, y)
+            fonts.get_atlas(main_font, w_color).draw(
+                    self.image, word, (p + j + dx, p + 2 - j + dy)
             )
 
 
@@ -561,6 +808,8 @@ player = Player()
 bullets = pygame.sprite.Group()
 enemies = pygame.sprite.Group()
 blotches = pygame.sprite.Group()
+Blotch.make_variants()
+blotch_pool = SpritePool(Blotch, MAX_BLOTCHES, groups=(blotches,))
 effect_sprites = pygame.sprite.Group()
 delta_x = -300 + screen_scale(150)
 poem = Poem(quatrain, delta_x=delta_x)
@@ -568,39 +817,77 @@ poem = Poem(quatrain, delta_x=delta_x)
 # These margins are used by WordPaths.
 TOP_MARGIN = 35
 BOTTOM_MARGIN = player.rect.height
-word_paths = WordPaths(quatrain)
+word_paths = WordPaths(quatrain, current_quatrain)
+word_paths.start()
 
-# Create enemies and initialize tiles_by_idx
+# Word tiles are created by spawn_due_tiles() as they're needed; this maps
+# tile indexes to the live ones.
 tiles_by_idx = {}
-for i, s in enumerate(word_paths.substrings):
-    x, y, _ = word_paths.get_tile_pos(i, 0)
-    enemy = Enemy(x, y, i, s)
-    enemies.add(enemy)
-    tiles_by_idx[i] = enemy
-    if i == 0:
-        enemy.make_next()
 
 all_sprites = pygame.sprite.Group()
 all_sprites.add(player)
-all_sprites.add(enemies)
+
+Bullet.make_template()
+bullet_system = BulletSystem(
+        Bullet, MAX_BULLETS, groups=(bullets,), bounds=screen.get_rect()
+)
+last_shot_time = None
+
+# The Prefetcher building the next quatrain, if there is one.
+prefetcher = None
+prefetch_stats = []
 
 running = True
 score = 0
+frames_drawn = 0
+quatrains_done = 0
 font = pygame.font.SysFont(None, 36)
 
 def shoot_bullet():
-    bullet = Bullet(
-            player.rect.centerx + screen_scale(60), player.rect.top
+    global last_shot_time
+    now = gametime.get_ticks()
+    if last_shot_time is not None and (
+            now - last_shot_time < MIN_SHOT_INTERVAL * 1000):
+        return
+    bullet = bullet_system.spawn(
+            (player.rect.centerx + screen_scale(60), player.rect.top),
+            (0, -BULLET_SPEED)
     )
-    all_sprites.add(bullet)
-    bullets.add(bullet)
+    if bullet is not None:
+        last_shot_time = now
 
 # ______________________________________________________________________
 # Mode-switching functions
 
+def prepare_quatrain(quatrain_num):
+    ''' A prefetch job that builds what start_next_quatrain() needs for
+        quatrain `quatrain_num`, yielding between pieces of work. It returns
+        (word_paths, poem).
+    '''
+    quatrain = cur_poem[quatrain_num - 1]
+    paths = WordPaths(quatrain, quatrain_num)
+    yield
+
+    # Render each tile's background now, in spawn order, so spawning the
+    # tile later only has to copy it. The NineSlice cache holds only
+    # max_cached_renders sizes and evicts the least recent first, so stop
+    # once it's full; rendering more would evict the tiles needed soonest.
+    sizes = set()
+    for i in paths.get_spawn_order():
+        s = paths.substrings[i]
+        size = Enemy.get_size(s)
+        if size not in sizes and len(sizes) == NineSlice.max_cached_renders:
+            break
+        sizes.add(size)
+        Enemy.prepare(s)
+        yield
+
+    return paths, Poem(quatrain, delta_x=delta_x)
+
 def switch_to_between_quatrains():
-    global game_mode, msg, next_q_is_ready
+    global game_mode, msg, next_q_is_ready, quatrains_done, prefetcher
     game_mode = 'between_quatrains'
+    quatrains_done += 1
     debug_print('Mode:', game_mode)
     msg = Message(
             f'Quatrain {current_quatrain} Complete',
@@ -619,69 +906,71 @@ def switch_to_between_quatrains():
 
     anim.call_after_delay(enable_continue, delay_seconds=2)
 
+    # Build the next quatrain a little at a time while the message is up.
+    if current_quatrain < len(cur_poem):
+        prefetcher = Prefetcher(prepare_quatrain(current_quatrain + 1))
+
 def start_next_quatrain():
     global game_mode, msg, word_paths, current_quatrain, poem, tiles_by_idx
+    global next_word_idx, prefetcher
     game_mode = 'playing'
     debug_print('Mode:', game_mode)
     msg.kill()
 
-    quatrain = cur_poem[current_quatrain]
     current_quatrain += 1
+    if prefetcher is None:
+        prefetcher = Prefetcher(prepare_quatrain(current_quatrain))
+    word_paths, poem = prefetcher.finish()
+    prefetch_stats.append(prefetcher.get_stats())
+    prefetcher = None
 
     tiles_by_idx = {}
-    word_paths = WordPaths(quatrain)
-    for i, s in enumerate(word_paths.substrings):
-        x, y, _ = word_paths.get_tile_pos(i, 0)
-        enemy = Enemy(x, y, i, s)
-        enemies.add(enemy)
-        all_sprites.add(enemy)
-        tiles_by_idx[i] = enemy
-        if i == 0:
-            enemy.make_next()
-
-    poem = Poem(quatrain, delta_x=delta_x)
-
-while running:
-    clock.tick(60)
-    anim.handle_anim_events()
-
-    if game_mode == 'playing' and len(enemies) == 0:
-        switch_to_between_quatrains()
+    next_word_idx = 0
+    word_paths.start()
+    renderer.invalidate()
 
-    # Check for quit event
-    for event in pygame.event.get():
-
-        # Handle universal events.
-        if event.type == pygame.QUIT:
-            running = False
-            break
-
-        # Handle events per game mode.
-        if game_mode == 'playing':
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    shoot_bullet()
-            elif event.type == pygame.JOYBUTTONDOWN:
-                if event.button == 0:
-                    shoot_bullet()
-        elif game_mode == 'between_quatrains':
-            if next_q_is_ready:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN:
-                        start_next_quatrain()
-                elif event.type == pygame.JOYBUTTONDOWN:
-                    if event.button == 0:
-                        start_next_quatrain()
+def draw_static_layers(surface):
+    ''' Draw the parts of the screen that rarely change. '''
+    bg_x = (screen_w - background_image.get_width()) // 2
+    bg_y = (screen_h - background_image.get_height()) // 2
+    surface.blit(background_image, (bg_x, bg_y))
+    surface.blit(poem.image, poem.rect)
+
+renderer = render.make_renderer(screen, draw_static_layers)
+
+# Set up the heads-up display.
+hud_atlas = fonts.get_atlas(main_font, WHITE, antialias=True)
+game_hud = HUD()
+game_hud.add('score', Widget(hud_atlas, 'Score: {}', (10, 10)))
+game_hud.add('quatrain', Widget(
+        hud_atlas, 'Quatrain {}', (screen_w - 10, 10), align='right'
+))
+if hud.show_fps:
+    game_hud.add('fps', FPSWidget(
+        hud_atlas, (10, 10 + screen_scale(30))
+    ))
+
+def simulate_step():
+    """ Advance the game by one fixed step of SIM_STEP_MS. Everything that
+        moves by a set amount per update moves here, so gameplay speed
+        doesn't depend on the frame rate.
+    """
+    global score
 
     # Update sprites
+    spawn_due_tiles(timestep.sim_ms)
     all_sprites.update()
+    bullet_system.step()
     blotches.update()
+    frame_timer.end_phase('update')
 
     # Check for collisions
-    hits = pygame.sprite.groupcollide(enemies, bullets, True, True)
+    hits = collision.groupcollide(
+            enemies, bullets, True, True, word_paths.row_skip, swept=True
+    )
     if len(hits) > 0:
         splat.play()
-    gone_bullets = set()
+    gone_bullets = {}  # A dict as an ordered set, so runs are repeatable.
     next_word_was_hit = False
     for hit, bullet_list in hits.items():
         if hit.is_next:
@@ -705,8 +994,9 @@ while running:
         else:
             score += 1
         poem.highlight_word_idx(hit.tile_idx)
+        renderer.invalidate(poem.get_word_rect(hit.tile_idx))
         del tiles_by_idx[hit.tile_idx]
-        gone_bullets |= set(bullet_list)
+        gone_bullets |= dict.fromkeys(bullet_list)
         if False:
             # Spawn a new enemy at a random position
             x = random.randint(0, screen_w - ENEMY_WIDTH)
@@ -718,25 +1008,98 @@ while running:
         # Update next_word_idx to the next alive word
         update_next_word()
     for b in gone_bullets:
-        x, y = b.rect.centerx, b.rect.centery
-        blotch = Blotch(b.rect.centerx, b.rect.centery)
-        blotches.add(blotch)
+        blotch_pool.spawn(b.rect.centerx, b.rect.centery)
+    frame_timer.end_phase('collide')
 
-    # Draw everything
-    bg_x = (screen_w - background_image.get_width()) // 2
-    bg_y = (screen_h - background_image.get_height()) // 2
-    screen.blit(background_image, (bg_x, bg_y))
-    screen.blit(poem.image, poem.rect)
-    blotches.draw(screen)
-    effect_sprites.draw(screen)
-    all_sprites.draw(screen)
+while running:
+    gametime.tick(render_fps)
+    frame_timer.start_frame()
+    anim.handle_anim_events()
+
+    is_quatrain_done = len(enemies) == 0 and not word_paths.pending
+    if game_mode == 'playing' and is_quatrain_done:
+        switch_to_between_quatrains()
 
-    # Draw score
-    score_text = main_font.render(f"Score: {score}", True, WHITE)
-    screen.blit(score_text, (10, 10))
+    if scripted_input:
+        scripted_input.next_frame(game_mode)
+
+    # Check for quit event
+    for event in pygame.event.get():
+
+        # Handle universal events.
+        if event.type == pygame.QUIT:
+            running = False
+            break
+
+        # Handle events per game mode.
+        if game_mode == 'playing':
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    shoot_bullet()
+            elif event.type == pygame.JOYBUTTONDOWN:
+                if event.button == 0:
+                    shoot_bullet()
+        elif game_mode == 'between_quatrains':
+            if next_q_is_ready:
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_RETURN:
+                        start_next_quatrain()
+                elif event.type == pygame.JOYBUTTONDOWN:
+                    if event.button == 0:
+                        start_next_quatrain()
+
+    if prefetcher:
+        prefetcher.run(PREFETCH_BUDGET_MS)
+
+    # Advance the simulation in fixed steps, as many as this frame needs.
+    for _ in timestep.steps(gametime.get_ticks()):
+        simulate_step()
+
+    # Draw everything
+    renderer.begin_frame()
+    renderer.draw_group(blotches)
+    renderer.draw_group(effect_sprites)
+    moving = [player, *bullets, *enemies]
+    with render.interpolated(moving, timestep.alpha):
+        renderer.draw_group(bullets)
+        renderer.draw_group(all_sprites)
+
+    # Draw the score and other overlays
+    game_hud.set('score', score)
+    game_hud.set('quatrain', current_quatrain)
+    game_hud.draw(renderer)
+    frame_timer.end_phase('draw')
 
     # Refresh display
-    pygame.display.flip()
+    renderer.end_frame()
     pygame.mouse.set_visible(False)
+    frame_timer.end_phase('flip')
+    frame_timer.end_frame()
+    frames_drawn += 1
+
+    if bench.is_active:
+        # Stop at the requested limit, or once there are no quatrains left.
+        out_of_quatrains = (
+                game_mode == 'between_quatrains' and
+                current_quatrain >= len(cur_poem)
+        )
+        if out_of_quatrains or bench.is_done(frames_drawn, quatrains_done):
+            running = False
+
+if bench.is_active:
+    frame_timer.report(quatrains_done)
+    assets.print_stats()
+    NineSlice.print_stats()
+    render.print_stats(renderer)
+    collision.print_stats()
+    game_hud.print_stats()
+    print(f'Bullets:  {bullet_system.get_stats()}')
+    print(f'Blotches: {blotch_pool.get_stats()}')
+    anim.print_timer_stats()
+    anim.tweens.print_stats()
+    print(f'Simulation: {timestep.num_steps} steps,'
+          f' {timestep.dropped_ms:.0f} ms dropped')
+    for stats in prefetch_stats:
+        print(f'Prefetch: {stats}')
 
 pygame.quit()
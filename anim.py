@@ -7,46 +7,383 @@
 # ______________________________________________________________________
 # Imports
 
+import hashlib
+import heapq
+import itertools
+import math
 import pygame
 import weakref
+from collections import OrderedDict
 
 import numpy as np
 
+import gametime
+
 
 # ______________________________________________________________________
 # Delayed-Call System
 
-actions = []  # list of (timestamp, fn)
+# At most this many scheduled calls run per frame; any others that are due
+# wait for the next frame.
+MAX_CALLBACKS_PER_FRAME = 32
+
+class Timer:
+    """
+    A handle for a scheduled call, as returned by call_after_delay() and
+    call_every(). Call cancel() to stop it from running (again).
+    """
+
+    def __init__(self, fn, deadline, interval=None):
+        self.fn = fn
+        self.deadline = deadline  # In ms.
+        self.interval = interval  # In ms; None for one-shot timers.
+        self.is_cancelled = False
+        self.is_done = False
+
+    def cancel(self):
+        global _num_pending
+        if not (self.is_cancelled or self.is_done):
+            _num_pending -= 1
+        self.is_cancelled = True
+
+# A heap of (deadline, seq, timer); seq keeps equal deadlines in FIFO order.
+# Cancelled timers are left in place and skipped when they come up.
+_timer_heap = []
+_seq = itertools.count()
+_num_pending = 0
+
+# Callback latency is how late (in ms) a call ran after its deadline.
+timer_stats = {'calls': 0, 'total_latency': 0, 'max_latency': 0}
+
+def _schedule(timer):
+    heapq.heappush(_timer_heap, (timer.deadline, next(_seq), timer))
 
 def call_after_delay(fn, delay_seconds):
-    now = pygame.time.get_ticks()
-    deadline = now + int(delay_seconds * 1000)
-    actions.append((deadline, fn))
-    actions.sort(key=lambda x: x[0])
+    """Call `fn()` once, `delay_seconds` from now. Returns a Timer."""
+    global _num_pending
+    now = gametime.get_ticks()
+    timer = Timer(fn, now + int(delay_seconds * 1000))
+    _schedule(timer)
+    _num_pending += 1
+    return timer
+
+def call_every(fn, interval_seconds, first_delay_seconds=None):
+    """
+    Call `fn()` every `interval_seconds`, starting after `first_delay_seconds`
+    (or after one interval if that's None). Returns a Timer.
+    """
+    global _num_pending
+    if first_delay_seconds is None:
+        first_delay_seconds = interval_seconds
+    now = gametime.get_ticks()
+    timer = Timer(
+            fn,
+            now + int(first_delay_seconds * 1000),
+            max(1, int(interval_seconds * 1000))
+    )
+    _schedule(timer)
+    _num_pending += 1
+    return timer
+
+def get_queue_depth():
+    """
+    Return how many scheduled calls are waiting to run. A repeating timer
+    counts once.
+    """
+    return _num_pending
+
+def _run_due_timers(now):
+    global _num_pending
+    num_run = 0
+    while _timer_heap and _timer_heap[0][0] <= now:
+        if num_run >= MAX_CALLBACKS_PER_FRAME:
+            break
+        _, _, timer = heapq.heappop(_timer_heap)
+        if timer.is_cancelled:
+            continue
+
+        latency = now - timer.deadline
+        timer_stats['calls'] += 1
+        timer_stats['total_latency'] += latency
+        timer_stats['max_latency'] = max(timer_stats['max_latency'], latency)
+
+        timer.fn()
+        num_run += 1
+
+        if timer.is_cancelled:
+            continue  # fn() cancelled its own timer.
+        if timer.interval is None:
+            timer.is_done = True
+            _num_pending -= 1
+        else:
+            timer.deadline += timer.interval
+            _schedule(timer)
+
+def print_timer_stats():
+    calls = timer_stats['calls']
+    mean = timer_stats['total_latency'] / calls if calls else 0
+    print(f'Timers: {calls} calls, {get_queue_depth()} pending,'
+          f' latency mean {mean:.1f} ms, max {timer_stats["max_latency"]:.1f} ms')
 
 
 # ______________________________________________________________________
 # Per-Frame Hook for All AnimSprites
 
+# Only sprites with animations in progress are in here; idle sprites are
+# skipped entirely.
 _active_sprites = weakref.WeakSet()
 
 def handle_anim_events():
     """
-    1) Process any scheduled one-shot actions (e.g. call_after_delay).
-    2) Update all AnimSprite instances exactly once this frame.
+    1) Run any scheduled calls that are due (e.g. from call_after_delay),
+       up to MAX_CALLBACKS_PER_FRAME of them.
+    2) Advance every tween in one vectorized step.
+    3) Update all AnimSprite instances exactly once this frame.
+    4) Retire finished tweens, which runs their .then() callbacks.
     """
-    now = pygame.time.get_ticks()
+    now = gametime.get_ticks()
 
     # 1) Handle any delayed-call actions
-    while actions and now >= actions[0][0]:
-        _, fn = actions[0]
-        fn()
-        del actions[0]
+    _run_due_timers(now)
+
+    # 2) Advance all tweens
+    finished = tweens.step(now)
 
-    # 2) Update all active AnimSprites
+    # 3) Update all active AnimSprites
     for sprite in list(_active_sprites):
         sprite.update(now)
 
+    # 4) Retire finished tweens
+    tweens.finish(finished)
+
+
+# ______________________________________________________________________
+# Flash-Cycle Frame Cache
+
+FLASH_CYCLE_MS = 1000
+
+# How many distinct overlay frames make up one flash cycle.
+FLASH_FRAMES_PER_CYCLE = 30
+
+# The most sets of flash frames we keep; the least recently used go first.
+MAX_CACHED_FLASH_SETS = 64
+
+# Maps (alpha mask digest, frames per cycle) -> list of overlay surfaces.
+_flash_frames = OrderedDict()
+
+def _get_flash_factor(elapsed):
+    # T = 0..FLASH_CYCLE_MS, we move "up" 0->0.8, then "down" 0.8->0
+    half_cycle = FLASH_CYCLE_MS / 2
+    if elapsed <= half_cycle:
+        return 0.8 * (elapsed / half_cycle)
+    return 0.8 * (1 - (elapsed - half_cycle) / half_cycle)
+
+def get_flash_frames(base_surface, frames_per_cycle):
+    """
+    Return the white overlays for one flash cycle of `base_surface`. The
+    overlays only depend on the surface's alpha mask, so all surfaces with the
+    same mask share one list.
+    """
+    alpha_mask = pygame.surfarray.array_alpha(base_surface)
+    key = (
+            base_surface.get_size(),
+            hashlib.sha1(alpha_mask.tobytes()).digest(),
+            frames_per_cycle
+    )
+    if key in _flash_frames:
+        _flash_frames.move_to_end(key)
+        return _flash_frames[key]
+
+    frames = []
+    mask = alpha_mask.astype(np.float32) / 255
+    for i in range(frames_per_cycle):
+        elapsed = i * FLASH_CYCLE_MS / frames_per_cycle
+        alpha = int(_get_flash_factor(elapsed) * 255)
+        overlay = pygame.Surface(base_surface.get_size(), pygame.SRCALPHA)
+        overlay.fill((255, 255, 255, 0))
+        overlay_alpha = pygame.surfarray.pixels_alpha(overlay)
+        overlay_alpha[:] = (alpha * mask).astype(np.uint8)
+        # We need to delete this in order to unlock the surface.
+        del overlay_alpha
+        frames.append(overlay)
+
+    _flash_frames[key] = frames
+    if len(_flash_frames) > MAX_CACHED_FLASH_SETS:
+        _flash_frames.popitem(last=False)
+    return frames
+
+
+# ______________________________________________________________________
+# Rotation Cache
+
+# Rotations are rounded to a multiple of this many degrees.
+ROTATION_STEP_DEGREES = 3
+
+# The most rotated surfaces we keep; the least recently used go first.
+MAX_CACHED_ROTATIONS = 512
+
+# Maps (id(base_surface), angle) -> (base_surface, rotated surface). We hold on
+# to base_surface so that its id can't be reused while it's in here.
+_rotations = OrderedDict()
+
+def get_rotated_surface(base_surface, angle, step=ROTATION_STEP_DEGREES):
+    """
+    Return `base_surface` rotated by `angle` degrees, rounded to a multiple of
+    `step`. Results are shared between callers, so don't modify them.
+    """
+    angle = (round(angle / step) * step) % 360
+    key = (id(base_surface), angle)
+    entry = _rotations.get(key)
+    if entry is not None:
+        _rotations.move_to_end(key)
+        return entry[1]
+
+    rotated = pygame.transform.rotate(base_surface, angle)
+    _rotations[key] = (base_surface, rotated)
+    if len(_rotations) > MAX_CACHED_ROTATIONS:
+        _rotations.popitem(last=False)
+    return rotated
+
+
+# ______________________________________________________________________
+# Tween Engine
+
+# Easing curves map progress in [0, 1] to eased progress. Each one works on
+# a whole NumPy array of progress values at once.
+
+def _ease_linear(t):
+    return t
+
+def _ease_in_quad(t):
+    return t * t
+
+def _ease_out_quad(t):
+    return t * (2 - t)
+
+def _ease_in_out_quad(t):
+    return np.where(t < 0.5, 2 * t * t, -1 + (4 - 2 * t) * t)
+
+def _ease_out_cubic(t):
+    return 1 - (1 - t) ** 3
+
+def _ease_in_out_sine(t):
+    return 0.5 - 0.5 * np.cos(np.pi * t)
+
+def _ease_out_back(t):
+    c = 1.70158
+    return 1 + (c + 1) * (t - 1) ** 3 + c * (t - 1) ** 2
+
+EASINGS = {
+    'linear':      _ease_linear,
+    'in_quad':     _ease_in_quad,
+    'out_quad':    _ease_out_quad,
+    'in_out_quad': _ease_in_out_quad,
+    'out_cubic':   _ease_out_cubic,
+    'in_out_sine': _ease_in_out_sine,
+    'out_back':    _ease_out_back,
+}
+_easing_ids = {name: i for i, name in enumerate(EASINGS)}
+_easing_fns = list(EASINGS.values())
+
+class TweenEngine:
+    """
+    All active tweens, kept as parallel NumPy arrays (start, end, t0,
+    duration, easing id) so that one vectorized step advances every tween.
+    Each tween occupies one row, and its current value is written to the
+    same row of self.values; that row is the tween's target slot.
+    """
+
+    def __init__(self, capacity=64):
+        self.start    = np.zeros(capacity)
+        self.end      = np.zeros(capacity)
+        self.t0       = np.zeros(capacity)
+        self.duration = np.zeros(capacity)
+        self.easing   = np.zeros(capacity, dtype=np.int8)
+        self.active   = np.zeros(capacity, dtype=bool)
+        self.values   = np.zeros(capacity)
+
+        self._on_finish = [None] * capacity
+        self._free_rows = list(reversed(range(capacity)))
+
+        # Counters for the bench report.
+        self.num_started = 0
+        self.max_active = 0
+
+    def _grow(self):
+        old = len(self.active)
+        for name in ['start', 'end', 't0', 'duration', 'easing', 'active',
+                     'values']:
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate([array, np.zeros_like(array)]))
+        self._on_finish.extend([None] * old)
+        self._free_rows.extend(reversed(range(old, 2 * old)))
+
+    def add(self, start, end, duration_ms, easing='linear', on_finish=None):
+        """
+        Start a tween from `start` to `end` over `duration_ms`, beginning
+        now. `on_finish()` is called once it's done. Returns its row.
+        """
+        if not self._free_rows:
+            self._grow()
+        row = self._free_rows.pop()
+        self.num_started += 1
+        self.max_active = max(self.max_active, len(self.active) -
+                              len(self._free_rows))
+        self.start[row]    = start
+        self.end[row]      = end
+        self.t0[row]       = gametime.get_ticks()
+        self.duration[row] = duration_ms
+        self.easing[row]   = _easing_ids[easing]
+        self.active[row]   = True
+        self.values[row]   = start
+        self._on_finish[row] = on_finish
+        return row
+
+    def step(self, now):
+        """
+        Write the value of every active tween at time `now` into
+        self.values, and return the rows of tweens that have now finished.
+        Pass those rows to finish() once everyone has read their values.
+        """
+        rows = np.flatnonzero(self.active)
+        if rows.size == 0:
+            return rows
+        duration = self.duration[rows]
+        elapsed = now - self.t0[rows]
+        progress = np.ones(rows.size)
+        has_length = duration > 0
+        progress[has_length] = elapsed[has_length] / duration[has_length]
+        progress = np.clip(progress, 0, 1)
+
+        easing = self.easing[rows]
+        for easing_id in np.unique(easing):
+            mask = (easing == easing_id)
+            progress[mask] = _easing_fns[easing_id](progress[mask])
+
+        start = self.start[rows]
+        self.values[rows] = start + (self.end[rows] - start) * progress
+        return rows[elapsed >= duration]
+
+    def finish(self, rows):
+        """Free the given rows and call their on_finish functions."""
+        for row in rows.tolist():
+            self.active[row] = False
+            on_finish = self._on_finish[row]
+            self._on_finish[row] = None
+            self._free_rows.append(row)
+            if on_finish:
+                on_finish()
+
+    def get_num_active(self):
+        return int(np.count_nonzero(self.active))
+
+    def print_stats(self):
+        print(f'Tweens: {self.num_started} started,'
+              f' {self.get_num_active()} active, peak {self.max_active},'
+              f' capacity {len(self.active)}')
+
+tweens = TweenEngine()
+
 
 # ______________________________________________________________________
 # AnimSprite Class
@@ -55,96 +392,94 @@ class AnimSprite(pygame.sprite.Sprite):
     def __init__(self, base_surface):
         super().__init__()
         self.base_surface = base_surface
-        self.image = self.base_surface.copy()
+
+        # Each frame we redraw into this same surface, rather than making a
+        # new copy of base_surface.
+        self._scratch = self.base_surface.copy()
+        self._has_pixel_alpha = bool(
+                self._scratch.get_flags() & pygame.SRCALPHA
+        )
+
+        self.image = self._scratch
         self.base_rect = self.rect = self.image.get_rect()
 
+        # Rotated frames are drawn into this, which is big enough for any
+        # angle; it's created when first needed.
+        self._rotation_canvas = None
+
         # A list of "chains." Each chain is a list of callables (animation fns).
         # On each frame, we call the first callable of each chain; if it returns
         # False, we pop it. If the chain is empty, we remove the chain entirely.
+        # Flashing runs this way; slides, rotations and fades are tweens.
         self.fn_chains = []
 
-        # For chaining “.then(fn)” we store the most recently created chain.
-        self._last_chain = None
+        # Tweens in progress, as a list of (kind, row, params), where row is
+        # the tween's row in the shared TweenEngine.
+        self._tweens = []
+
+        # For chaining “.then(fn)” we store the callbacks list of the most
+        # recently created tween.
+        self._last_callbacks = None
 
         # If we start indefinite flashing, we keep its chain reference.
         self._flash_chain = None
 
+    def _add_chain(self, chain):
+        self.fn_chains.append(chain)
         _active_sprites.add(self)
 
+    def _add_tween(self, kind, start, end, duration_ms, easing, params):
+        callbacks = []
+
+        def on_finish():
+            self._tweens.remove(entry)
+            for fn in callbacks:
+                fn()
+
+        row = tweens.add(start, end, duration_ms, easing, on_finish)
+        entry = (kind, row, params)
+        self._tweens.append(entry)
+        self._last_callbacks = callbacks
+        _active_sprites.add(self)
+        return self
+
     # __________________________________________________________________
     # Slide
 
-    def slide(self, delta, duration=1.0):
+    def slide(self, delta, duration=1.0, easing='linear'):
         """
         Slide the sprite by `delta` (x, y) over `duration` seconds.
         """
-        start_time = pygame.time.get_ticks()
-        end_time = start_time + int(duration * 1000)
-        start_pos = self.rect.topleft
-
-        def slide_anim(now):
-            now = min(now, end_time)
-            ongoing = (now < end_time)
-
-            elapsed = now - start_time
-            if end_time > start_time:
-                frac = elapsed / (end_time - start_time)
-            else:
-                frac = 1.0
-
-            new_x = start_pos[0] + int(delta[0] * frac)
-            new_y = start_pos[1] + int(delta[1] * frac)
-            self.rect.topleft = (new_x, new_y)
-
-            return ongoing
-
-        chain = [slide_anim]
-        self.fn_chains.append(chain)
-        self._last_chain = chain
-        return self
+        params = (self.rect.topleft, delta)
+        return self._add_tween(
+                'slide', 0.0, 1.0, int(duration * 1000), easing, params
+        )
 
     # __________________________________________________________________
     # Flashing
 
-    def start_flashing(self):
-        """Begin indefinite flashing, if not already active."""
+    def start_flashing(self, frames_per_cycle=FLASH_FRAMES_PER_CYCLE):
+        """
+        Begin indefinite flashing, if not already active. The flash is
+        quantized to `frames_per_cycle` precomputed frames per cycle.
+        """
         if self._flash_chain is not None:
             return  # already flashing
 
-        flash_start_time = pygame.time.get_ticks()
-        cycle_duration = 1000  # ms
+        flash_start_time = gametime.get_ticks()
+        frames = get_flash_frames(self.base_surface, frames_per_cycle)
 
         def flash_anim(now):
-            # T = 0..cycle_duration, we move "up" 0->0.8, then "down" 0.8->0
-            elapsed = (now - flash_start_time) % cycle_duration
-            half_cycle = cycle_duration / 2
-            if elapsed <= half_cycle:
-                factor = 0.8 * (elapsed / half_cycle)
-            else:
-                factor = 0.8 * (1 - (elapsed - half_cycle) / half_cycle)
-
-            # Create an overlay surface with the desired alpha.
-            alpha = int(factor * 255)
-            overlay = pygame.Surface(self.image.get_size(), pygame.SRCALPHA)
-            overlay.fill((255, 255, 255, alpha))
-
-            # Use the alpha mask from self.image.
-            alpha_mask = pygame.surfarray.pixels_alpha(self.image)
-            overlay_alpha = pygame.surfarray.pixels_alpha(overlay)
-            overlay_alpha[:] = (
-                    overlay_alpha * (alpha_mask.astype(np.float32) / 255)
-            ).astype(np.uint8)
-            # We need to delete these in order to unlock the surfaces.
-            del alpha_mask
-            del overlay_alpha
+            elapsed = (now - flash_start_time) % FLASH_CYCLE_MS
+            idx = int(elapsed * frames_per_cycle // FLASH_CYCLE_MS)
 
             # Blit the overlay onto self.image
-            self.image.blit(overlay, (0, 0))
+            self.image.blit(frames[idx], (0, 0))
 
             return True  # never finishes on its own
 
         chain = [flash_anim]
-        self.fn_chains.append(chain)
+        self._add_chain(chain)
         self._flash_chain = chain
 
     def stop_flashing(self):
@@ -156,73 +491,31 @@ class AnimSprite(pygame.sprite.Sprite):
     # __________________________________________________________________
     # Rotate
 
-    def rotate(self, cycle_duration=0.5, stop_after_duration=1.5, center=None):
+    def rotate(self, cycle_duration=0.5, stop_after_duration=1.5, center=None,
+               step=ROTATION_STEP_DEGREES, easing='linear'):
         """
         Rotate 360 degrees over `cycle_duration` seconds, stopping after
         `stop_after_duration` seconds. Keeps the final rotation.
         If `center` is None, rotate around the sprite's current center.
         Otherwise, rotate around (center.x, center.y) in local coordinates.
+        Angles are rounded to multiples of `step` degrees so that rotated
+        surfaces can be cached and shared.
         """
-        start_time = pygame.time.get_ticks()
-        cycle_ms = cycle_duration * 1000
-        end_time = start_time + stop_after_duration * 1000
-
-        def rotate_anim(now):
-            now = min(now, end_time)
-            ongoing = (now < end_time)
-
-            elapsed = now - start_time
-            fraction = elapsed / cycle_ms if cycle_ms else 0
-            angle = 360 * fraction
-
-            rotated = pygame.transform.rotate(self.base_surface, angle)
-
-            old_center = self.rect.center  # Keep world center if center=None.
-            if center is None:
-                self.image = rotated
-                self.rect = self.image.get_rect(center=old_center)
-            else:
-                self.image = rotated
-                self.rect = self.image.get_rect()
-                # Shift so (center.x, center.y) stays where it was.
-                dx = center[0] - self.rect.width // 2
-                dy = center[1] - self.rect.height // 2
-                self.rect.move_ip(dx, dy)
-
-            return ongoing
-
-        chain = [rotate_anim]
-        self.fn_chains.append(chain)
-        self._last_chain = chain
-        return self
+        final_angle = 360 * stop_after_duration / cycle_duration if (
+                cycle_duration) else 0
+        return self._add_tween(
+                'rotate', 0.0, final_angle, stop_after_duration * 1000, easing,
+                (center, step)
+        )
 
     # __________________________________________________________________
     # Fade
 
-    def fade_out(self, duration=2.0):
+    def fade_out(self, duration=2.0, easing='linear'):
         """Fade to transparent over `duration` seconds."""
-        start_time = pygame.time.get_ticks()
-        end_time = start_time + int(duration * 1000)
-
-        def fade_anim(now):
-            now = min(now, end_time)
-            ongoing = (now < end_time)
-
-            elapsed = now - start_time
-            if end_time > start_time:
-                frac = 1.0 - (elapsed / (end_time - start_time))
-            else:
-                frac = 1.0
-
-            alpha_val = int(frac * 255)
-            self.image.set_alpha(alpha_val)
-
-            return ongoing
-
-        chain = [fade_anim]
-        self.fn_chains.append(chain)
-        self._last_chain = chain
-        return self
+        return self._add_tween(
+                'fade', 255.0, 0.0, int(duration * 1000), easing, None
+        )
 
     # __________________________________________________________________
     # Chaining
@@ -231,11 +524,8 @@ class AnimSprite(pygame.sprite.Sprite):
         """
         Schedules `fn()` to run after the most recent process finishes.
         """
-        if self._last_chain:
-            def callback_anim(_now):
-                fn()
-                return False  # one-shot
-            self._last_chain.append(callback_anim)
+        if self._last_callbacks is not None:
+            self._last_callbacks.append(fn)
         return self
 
     # __________________________________________________________________
@@ -244,14 +534,32 @@ class AnimSprite(pygame.sprite.Sprite):
     def update(self, now):
         """
         1) Reset self.image & self.rect to base each frame.
-        2) For each chain (iterated in reverse so we can safely del empty ones):
+        2) Apply the current values of any slide, then rotate tweens.
+        3) For each chain (iterated in reverse so we can safely del empty ones):
            - Call the first function in that chain.
            - If it returns False, pop it. If empty, remove the chain.
+        4) Apply the current values of any fade tweens.
+        Once no tweens or chains are left, the sprite stops receiving updates
+        until a new animation starts.
         """
 
-        self.image = self.base_surface.copy()
+        self._reset_image()
         self.rect = self.base_rect
 
+        if not self.fn_chains and not self._tweens:
+            _active_sprites.discard(self)
+            return
+
+        values = tweens.values
+        for kind, row, params in self._tweens:
+            if kind == 'slide':
+                (x, y), (dx, dy) = params
+                frac = values[row]
+                self.rect.topleft = (x + int(dx * frac), y + int(dy * frac))
+        for kind, row, params in self._tweens:
+            if kind == 'rotate':
+                self._apply_rotation(values[row], *params)
+
         # Iterate backwards so we can safely delete from fn_chains in-place.
         for i in reversed(range(len(self.fn_chains))):
             chain = self.fn_chains[i]
@@ -266,3 +574,57 @@ class AnimSprite(pygame.sprite.Sprite):
                 # If that was the only anim in the chain, remove the chain.
                 if not chain:
                     del self.fn_chains[i]
+
+        for kind, row, params in self._tweens:
+            if kind == 'fade':
+                self.image.set_alpha(int(values[row]))
+
+    def _apply_rotation(self, angle, center, step):
+        rotated = get_rotated_surface(self.base_surface, angle, step)
+
+        old_center = self.rect.center  # Keep world center if center=None.
+        if center is None:
+            self.image = self._draw_on_rotation_canvas(rotated)
+            self.rect = self.image.get_rect(center=old_center)
+        else:
+            self.image = self._draw_on_rotation_canvas(rotated)
+            self.rect = self.image.get_rect()
+            # Shift so (center.x, center.y) stays where it was.
+            dx = center[0] - self.rect.width // 2
+            dy = center[1] - self.rect.height // 2
+            self.rect.move_ip(dx, dy)
+
+    def _draw_on_rotation_canvas(self, rotated):
+        """
+        Copy the shared `rotated` surface, centered, onto this sprite's own
+        rotation canvas and return the canvas. Later anims in this frame
+        (such as a fade) can then change the image without touching the
+        cached surface.
+        """
+        canvas = self._rotation_canvas
+        if canvas is None:
+            w, h = self.base_surface.get_size()
+            side = math.ceil(math.hypot(w, h)) + 2
+            flags = pygame.SRCALPHA if self._has_pixel_alpha else 0
+            canvas = self._rotation_canvas = pygame.Surface((side, side), flags)
+        canvas.fill((0, 0, 0, 0))
+        pos = rotated.get_rect(center=canvas.get_rect().center)
+        if self._has_pixel_alpha:
+            canvas.blit(rotated, pos, special_flags=pygame.BLEND_RGBA_MAX)
+        else:
+            canvas.blit(rotated, pos)
+        canvas.set_alpha(self.base_surface.get_alpha())
+        return canvas
+
+    def _reset_image(self):
+        """Copy base_surface into the scratch surface and show that."""
+        scratch = self._scratch
+        if self._has_pixel_alpha:
+            # A normal blit would blend; this copies the pixels exactly.
+            scratch.fill((0, 0, 0, 0))
+            scratch.blit(self.base_surface, (0, 0),
+                         special_flags=pygame.BLEND_RGBA_MAX)
+        else:
+            scratch.blit(self.base_surface, (0, 0))
+        scratch.set_alpha(self.base_surface.get_alpha())
+        self.image = scratch
@@ -0,0 +1,161 @@
+''' assets.py
+
+    A process-wide cache of decoded images.
+
+    Each image file is loaded from disk and converted to the display's pixel
+    format just once; scaled versions are cached by scale factor. Surfaces
+    returned from here are shared, so callers must treat them as read-only
+    (copy them before drawing on them or calling set_alpha on them).
+
+    Scaled images are also baked to disk, in CACHE_DIR, as raw pixel data
+    keyed by file and scale. On later launches at the same scale (such as
+    --fullscreen on the same monitor) these are memory-mapped back in instead
+    of decoding and rescaling the PNG. A baked image is only used if its
+    metadata has the same source path and exact scale, and it's thrown out
+    when its source file's contents change. Pass --no-asset-cache to turn
+    this off.
+'''
+
+
+# ______________________________________________________________________
+# Imports
+
+import hashlib
+import json
+import mmap
+import os
+import sys
+
+import pygame
+
+
+# ______________________________________________________________________
+# Globals and constants
+
+CACHE_DIR = '.asset_cache'
+
+use_disk_cache = ('--no-asset-cache' not in sys.argv)
+
+# Maps (filename, has_alpha, scale_by) -> pygame.Surface.
+_surfaces = {}
+
+hits      = 0
+misses    = 0
+disk_hits = 0
+
+
+# ______________________________________________________________________
+# Internal functions
+
+def _load(filename, has_alpha):
+    image = pygame.image.load(filename)
+    return image.convert_alpha() if has_alpha else image.convert()
+
+def _get_baked_path(filename, scale_by, has_alpha):
+    ''' Return the baked path for these arguments, without an extension. '''
+    suffix = '' if has_alpha else '-opaque'
+    name = f'{os.path.basename(filename)}@{scale_by:.6g}{suffix}'
+    return os.path.join(CACHE_DIR, name)
+
+def _get_file_hash(filename):
+    with open(filename, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def _load_baked(filename, scale_by, has_alpha):
+    ''' Return the baked surface for these arguments, or None if there isn't
+        an up-to-date one.
+    '''
+    path = _get_baked_path(filename, scale_by, has_alpha)
+    try:
+        with open(path + '.json') as f:
+            meta = json.load(f)
+        # The file name only has the scale to 6 digits, and no directory.
+        if (meta['source'] != os.path.abspath(filename) or
+                meta['scale_by'] != scale_by):
+            return None
+        mtime = os.stat(filename).st_mtime
+        if meta['mtime'] != mtime:
+            # The file was touched; only rebake if its contents changed.
+            if meta['hash'] != _get_file_hash(filename):
+                return None
+            meta['mtime'] = mtime
+            with open(path + '.json', 'w') as f:
+                json.dump(meta, f)
+        with open(path + '.raw', 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                image = pygame.image.frombuffer(
+                        mm, (meta['width'], meta['height']), meta['format']
+                )
+                surface = image.convert_alpha() if has_alpha else image.convert()
+                # Release our view of the mmap before it's closed.
+                del image
+        return surface
+    except (OSError, ValueError, KeyError):
+        return None
+
+def _bake(filename, scale_by, has_alpha, surface):
+    ''' Write `surface` to the disk cache; failures are quietly ignored. '''
+    path = _get_baked_path(filename, scale_by, has_alpha)
+    fmt = 'RGBA' if has_alpha else 'RGBX'
+    meta = {
+            'source':   os.path.abspath(filename),
+            'scale_by': scale_by,
+            'mtime':    os.stat(filename).st_mtime,
+            'hash':     _get_file_hash(filename),
+            'width':    surface.get_width(),
+            'height':   surface.get_height(),
+            'format':   fmt
+    }
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(path + '.raw', 'wb') as f:
+            f.write(pygame.image.tobytes(surface, fmt))
+        # The metadata goes last so that a partial write is never trusted.
+        with open(path + '.json', 'w') as f:
+            json.dump(meta, f)
+    except OSError:
+        pass
+
+
+# ______________________________________________________________________
+# Public interface
+
+def load_image(filename, scale_by=1, has_alpha=True):
+    ''' Return the image in `filename`, scaled by `scale_by` and converted to
+        the display format. Set has_alpha=False for opaque images; these blit
+        faster. The display mode must be set before this is called.
+    '''
+    global hits, misses, disk_hits
+    key = (filename, has_alpha, scale_by)
+    surface = _surfaces.get(key)
+    if surface is not None:
+        hits += 1
+        return surface
+    misses += 1
+
+    if scale_by == 1:
+        surface = _load(filename, has_alpha)
+    elif use_disk_cache:
+        surface = _load_baked(filename, scale_by, has_alpha)
+        if surface is not None:
+            disk_hits += 1
+    if surface is None:
+        surface = pygame.transform.scale_by(
+                load_image(filename, 1, has_alpha), scale_by
+        )
+        if use_disk_cache:
+            _bake(filename, scale_by, has_alpha, surface)
+    _surfaces[key] = surface
+    return surface
+
+def get_memory_used():
+    ''' Return the number of bytes of pixel data held in the cache. '''
+    return sum(
+            surface.get_width() * surface.get_height() * surface.get_bytesize()
+            for surface in _surfaces.values()
+    )
+
+def print_stats():
+    print(f'Assets: {len(_surfaces)} surfaces cached,'
+          f' {get_memory_used() / 1024 / 1024:.1f} MiB,'
+          f' {hits} hits, {misses} misses ({disk_hits} from disk)')
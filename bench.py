@@ -0,0 +1,153 @@
+''' bench.py
+
+    A headless, deterministic benchmark mode for the main game loop.
+
+    Run it like so:
+
+        python3 EmilyBlaster.py --bench [--bench-frames=N] [--bench-quatrains=N]
+
+    This uses SDL's dummy video and audio drivers, a virtual clock, and a
+    scripted stream of input. The game runs as fast as it can until it has
+    drawn N frames or finished N quatrains, whichever comes first, and then
+    prints frame-time statistics.
+'''
+
+
+# ______________________________________________________________________
+# Imports
+
+import os
+import random
+import sys
+import time
+
+import pygame
+
+import cmdline
+import gametime
+
+
+# ______________________________________________________________________
+# Globals and constants
+
+is_active = ('--bench' in sys.argv)
+
+PHASES = ['update', 'collide', 'draw', 'flip']
+
+# The frame rate the virtual clock pretends to run at.
+BENCH_FPS = 60
+
+
+# ______________________________________________________________________
+# Internal functions
+
+def _percentile(sorted_values, p):
+    if not sorted_values:
+        return 0
+    idx = min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))
+    return sorted_values[idx]
+
+
+# ______________________________________________________________________
+# Public interface
+
+num_frames    = cmdline.get_arg('bench-frames', 3000)
+num_quatrains = cmdline.get_arg('bench-quatrains', 0)  # 0 means no limit.
+
+def init():
+    ''' Set up a headless, repeatable environment. This must be called before
+        pygame.init().
+    '''
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    random.seed(0)
+    gametime.set_clock(gametime.FixedStepClock())
+
+def is_done(frames_drawn, quatrains_done):
+    if frames_drawn >= num_frames:
+        return True
+    return num_quatrains > 0 and quatrains_done >= num_quatrains
+
+class ScriptedInput:
+    ''' A fixed, repeatable stream of player input.
+
+        The player sweeps left and right across the screen while firing at a
+        steady rate, and presses Enter whenever a quatrain is complete.
+    '''
+
+    fire_every  = 6    # Frames between shots.
+    sweep_every = 90   # Frames before changing direction.
+    enter_every = 30   # Frames between Enter presses between quatrains.
+
+    def __init__(self):
+        self.frame = 0
+        self.keys = {pygame.K_LEFT: False, pygame.K_RIGHT: True}
+
+    def next_frame(self, game_mode):
+        ''' Post this frame's input events and update the held keys. '''
+        self.frame += 1
+        going_right = (self.frame // self.sweep_every) % 2 == 0
+        self.keys[pygame.K_LEFT]  = not going_right
+        self.keys[pygame.K_RIGHT] = going_right
+
+        key = None
+        if game_mode == 'playing' and self.frame % self.fire_every == 0:
+            key = pygame.K_SPACE
+        if game_mode != 'playing' and self.frame % self.enter_every == 0:
+            key = pygame.K_RETURN
+        if key is not None:
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+    def get_pressed(self):
+        ''' A stand-in for pygame.key.get_pressed(). '''
+        return self.keys
+
+class FrameTimer:
+    ''' Track total frame time and the time spent in each phase of a frame.
+
+        Call start_frame(), then end_phase(name) after each phase, then
+        end_frame(). When not enabled, all of these return immediately.
+    '''
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.frame_times = []
+        self.phase_totals = {phase: 0.0 for phase in PHASES}
+        self.start_time = None
+
+    def start_frame(self):
+        if not self.enabled:
+            return
+        self._frame_start = self._phase_start = time.perf_counter()
+        if self.start_time is None:
+            self.start_time = self._frame_start
+
+    def end_phase(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phase_totals[phase] += now - self._phase_start
+        self._phase_start = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        self.frame_times.append(time.perf_counter() - self._frame_start)
+
+    def report(self, quatrains_done=0):
+        n = len(self.frame_times)
+        if n == 0:
+            print('Benchmark: no frames were drawn.')
+            return
+        wall = time.perf_counter() - self.start_time
+        ms = sorted(t * 1000 for t in self.frame_times)
+        print(f'Benchmark: {n} frames, {quatrains_done} quatrain(s)'
+              f' in {wall:.2f} s')
+        print(f'  Frames/sec: {n / wall:.1f}')
+        print('  Frame time (ms):' + ''.join(
+            f'  p{p} {_percentile(ms, p):.3f}' for p in [50, 95, 99]
+        ))
+        print('  Per-phase time (ms/frame):' + ''.join(
+            f'  {phase} {self.phase_totals[phase] * 1000 / n:.3f}'
+            for phase in PHASES
+        ))
@@ -0,0 +1,100 @@
+''' bullets.py
+
+    A bullet system that keeps every bullet's position and velocity in NumPy
+    arrays, so that moving and culling all of them is one vectorized step
+    per frame.
+
+    Each slot also has a sprite whose rect follows the arrays. The sprites
+    are only there for drawing and collisions; they have no update() of
+    their own. Each sprite's `prev_rect` holds its rect as of the previous
+    step, for swept collision tests. BulletSystem is a SpritePool that never
+    recycles, so spawn() hands out a free slot, and a slot is freed again
+    when its sprite is killed.
+'''
+
+
+# ______________________________________________________________________
+# Imports
+
+import numpy as np
+
+from pool import SpritePool
+
+
+# ______________________________________________________________________
+# Classes
+
+class BulletSystem(SpritePool):
+    def __init__(self, make_sprite, capacity, groups=(), bounds=None):
+        ''' `make_sprite()` returns a new PooledSprite; it's called
+            `capacity` times now, and all of the sprites must be the same
+            size. Spawned sprites are added to each group in `groups`.
+            Bullets are culled once they're entirely outside the Rect
+            `bounds`, if it's given.
+        '''
+        super().__init__(make_sprite, capacity, groups, recycle_oldest=False)
+        self.bounds = bounds
+
+        # Top-left positions and per-frame velocities, in pixels.
+        self.pos   = np.zeros((capacity, 2))
+        self.vel   = np.zeros((capacity, 2))
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        # The pool hands out sprites in creation order; give them slots.
+        self.sprites = list(reversed(self._free))
+        for slot, sprite in enumerate(self.sprites):
+            sprite.slot = slot
+            sprite.prev_rect = sprite.rect.copy()
+        self.size = np.array(self.sprites[0].rect.size)
+
+        self.num_culled = 0
+
+    def spawn(self, midbottom, velocity):
+        ''' Start a bullet with its bottom center at `midbottom`, moving by
+            `velocity` (dx, dy) each frame. Returns its sprite, or None if
+            every slot is in use.
+        '''
+        return super().spawn(midbottom, velocity)
+
+    def _on_spawn(self, sprite, midbottom, velocity):
+        slot = sprite.slot
+        sprite.rect.midbottom = midbottom
+        sprite.prev_rect.topleft = sprite.rect.topleft
+        self.pos[slot] = sprite.rect.topleft
+        self.vel[slot] = velocity
+        self.alive[slot] = True
+
+    def _on_release(self, sprite):
+        self.alive[sprite.slot] = False
+
+    def step(self, dt=1):
+        ''' Move every live bullet by `dt` frames' worth of velocity, kill
+            those that have left the bounds, and update the sprites' rects
+            and prev_rects.
+        '''
+        rows = np.flatnonzero(self.alive)
+        if rows.size == 0:
+            return
+        self.pos[rows] += self.vel[rows] * dt
+
+        if self.bounds is not None:
+            top_left = self.pos[rows]
+            bottom_right = top_left + self.size
+            b = self.bounds
+            is_out = (
+                    (bottom_right[:, 0] < b.left) | (top_left[:, 0] > b.right) |
+                    (bottom_right[:, 1] < b.top)  | (top_left[:, 1] > b.bottom)
+            )
+            for slot in rows[is_out].tolist():
+                self.sprites[slot].kill()
+                self.num_culled += 1
+            rows = rows[~is_out]
+
+        positions = self.pos[rows].astype(int).tolist()
+        for slot, topleft in zip(rows.tolist(), positions):
+            sprite = self.sprites[slot]
+            sprite.prev_rect.topleft = sprite.rect.topleft
+            sprite.rect.topleft = topleft
+
+    def get_stats(self):
+        return super().get_stats() + f', {self.num_culled} culled'
@@ -0,0 +1,24 @@
+''' cmdline.py
+
+    Read `--name=value` options from the command line.
+'''
+
+
+# ______________________________________________________________________
+# Imports
+
+import sys
+
+
+# ______________________________________________________________________
+# Public interface
+
+def get_arg(name, default=None, convert=int):
+    ''' Return the value of a `--name=value` argument, passed through
+        `convert`, or `default` if there's no such argument.
+    '''
+    prefix = f'--{name}='
+    for arg in sys.argv:
+        if arg.startswith(prefix):
+            return convert(arg[len(prefix):])
+    return default
@@ -0,0 +1,140 @@
+''' collision.py
+
+    Collision tests that only compare sprites that are near each other.
+
+    groupcollide() here is a drop-in replacement for
+    pygame.sprite.groupcollide(). Rather than testing every sprite in one
+    group against every sprite in the other, it buckets the first group's
+    sprites into horizontal bands of `row_height` pixels, and tests each
+    sprite of the second group only against the sprites in the bands it
+    overlaps. Word tiles travel along a few horizontal rows, so with bands
+    about one row tall each bullet is tested against just a handful of tiles.
+
+    With swept=True, sprites are tested over the whole frame rather than
+    just where they are now. Each sprite then needs a `prev_rect` holding
+    its rect as of the previous frame, and two sprites collide if their
+    rects overlap at any point as both move in a straight line from
+    prev_rect to rect. That way a fast bullet can't skip over a tile between
+    two frames, even at a low frame rate.
+'''
+
+
+# ______________________________________________________________________
+# Globals and constants
+
+# Counters to show how much work the broadphase saves.
+num_calls = 0
+num_pair_tests = 0
+num_all_pairs = 0
+
+
+# ______________________________________________________________________
+# Internal functions
+
+def _get_bands(rect, row_height):
+    return range(rect.top // row_height, (rect.bottom - 1) // row_height + 1)
+
+def _get_covered_rect(sprite, swept):
+    ''' Return the area `sprite` covers this frame. '''
+    if swept:
+        return sprite.rect.union(sprite.prev_rect)
+    return sprite.rect
+
+def _bucket(sprites, row_height, swept):
+    ''' Return a dict mapping band index -> list of (i, sprite), where i is
+        the sprite's index in `sprites`.
+    '''
+    buckets = {}
+    for i, sprite in enumerate(sprites):
+        for band in _get_bands(_get_covered_rect(sprite, swept), row_height):
+            buckets.setdefault(band, []).append((i, sprite))
+    return buckets
+
+def _sweptcollide(sprite_a, sprite_b):
+    ''' Return True if the sprites' rects overlap at any time as both move
+        linearly from prev_rect to rect. This works in sprite_a's frame of
+        reference, where sprite_b's top-left corner moves along a segment;
+        the rects overlap whenever that corner is strictly inside the box
+        (-b.w, a.w) x (-b.h, a.h). We clip the segment to that box, one axis
+        at a time.
+    '''
+    a0, a1 = sprite_a.prev_rect, sprite_a.rect
+    b0, b1 = sprite_b.prev_rect, sprite_b.rect
+    t_min, t_max = 0.0, 1.0
+    for start, end, lo, hi in [
+            (b0.x - a0.x, b1.x - a1.x, -b1.w, a1.w),
+            (b0.y - a0.y, b1.y - a1.y, -b1.h, a1.h)]:
+        d = end - start
+        if d == 0:
+            if not lo < start < hi:
+                return False
+            continue
+        t1, t2 = (lo - start) / d, (hi - start) / d
+        if t1 > t2:
+            t1, t2 = t2, t1
+        t_min, t_max = max(t_min, t1), min(t_max, t2)
+        if t_min >= t_max:
+            return False
+    return True
+
+
+# ______________________________________________________________________
+# Public interface
+
+def groupcollide(group_a, group_b, dokill_a, dokill_b, row_height,
+                 swept=False):
+    ''' Return a dict mapping each sprite in `group_a` that collides with
+        something in `group_b` to the list of sprites it collides with. This
+        matches pygame.sprite.groupcollide(), including its order and how
+        killed sprites are handled: with `dokill_b` set, a sprite in
+        `group_b` counts only as a hit on the first sprite of `group_a` that
+        it collides with. With `swept` set, every sprite needs a
+        `prev_rect`; see the module docstring.
+    '''
+    global num_calls, num_pair_tests, num_all_pairs
+    sprites_a = group_a.sprites()
+    sprites_b = group_b.sprites()
+    num_calls += 1
+    num_all_pairs += len(sprites_a) * len(sprites_b)
+
+    buckets = _bucket(sprites_a, row_height, swept)
+    hits_by_idx = {}  # Maps an index into sprites_a -> list of sprites.
+    for sprite_b in sprites_b:
+        rect = _get_covered_rect(sprite_b, swept)
+        hit_idx = set()
+        for band in _get_bands(rect, row_height):
+            for i, sprite_a in buckets.get(band, ()):
+                if i in hit_idx:
+                    continue
+                num_pair_tests += 1
+                if swept:
+                    # The covered rects are a cheap first test.
+                    is_hit = (
+                        _get_covered_rect(sprite_a, swept).colliderect(rect)
+                        and _sweptcollide(sprite_a, sprite_b)
+                    )
+                else:
+                    is_hit = sprite_a.rect.colliderect(rect)
+                if is_hit:
+                    hit_idx.add(i)
+        if dokill_b and hit_idx:
+            hit_idx = {min(hit_idx)}
+        for i in hit_idx:
+            hits_by_idx.setdefault(i, []).append(sprite_b)
+
+    hits = {}
+    for i in sorted(hits_by_idx):
+        hits[sprites_a[i]] = hits_by_idx[i]
+    for sprite_a, sprite_list in hits.items():
+        if dokill_a:
+            sprite_a.kill()
+        if dokill_b:
+            for sprite_b in sprite_list:
+                sprite_b.kill()
+    return hits
+
+def print_stats():
+    if num_calls == 0:
+        return
+    print(f'Collisions: {num_pair_tests / num_calls:.1f} pair tests/call'
+          f' (of {num_all_pairs / num_calls:.1f} possible)')
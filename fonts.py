@@ -1,8 +1,16 @@
 ''' fonts.py
 
     A centralized place for loading and working with fonts.
+
+    Text is drawn from glyph atlases: each (font, color, antialias) combination
+    renders its glyphs once into a single sheet, and strings are drawn by
+    blitting rects from that sheet. Both of our fonts are pixel fonts without
+    kerning, so this gives the same pixels as font.render(). Use measure() to
+    size text without drawing it.
 '''
 
+import string
+
 import pygame
 
 from screen_setup import screen_scale
@@ -14,6 +22,73 @@ from screen_setup import screen_scale
 main_font = None
 nice_font = None
 
+# Maps (font, color, antialias) -> GlyphAtlas.
+_atlases = {}
+
+
+# ______________________________________________________________________
+# Glyph atlases
+
+class GlyphAtlas:
+    def __init__(self, font, color, antialias=False):
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+
+        # Per character, the rect of its glyph in self.sheet, and how far to
+        # move right after drawing it.
+        self.rects = {}
+        self.advances = {}
+
+        self._build_sheet(string.printable.strip() + ' ')
+
+    def _build_sheet(self, chars):
+        glyphs = []
+        for ch in chars:
+            glyph = self.font.render(ch, self.antialias, self.color)
+            glyphs.append(glyph.convert_alpha())
+            self.advances[ch] = self.font.metrics(ch)[0][4]
+        w = sum(glyph.get_width() for glyph in glyphs)
+        h = max(glyph.get_height() for glyph in glyphs)
+        self.sheet = pygame.Surface((w, h), pygame.SRCALPHA)
+        x = 0
+        for ch, glyph in zip(chars, glyphs):
+            self.rects[ch] = self.sheet.blit(glyph, (x, 0))
+            x += glyph.get_width()
+
+    def _add_chars(self, text):
+        ''' Rebuild the sheet to include any new characters in `text`. '''
+        new_chars = set(text) - self.rects.keys()
+        if new_chars:
+            self._build_sheet(list(self.rects) + sorted(new_chars))
+
+    def measure(self, text):
+        ''' Return the (w, h) that render(text) would have. '''
+        self._add_chars(text)
+        w = sum(self.advances[ch] for ch in text)
+        h = max((self.rects[ch].height for ch in text), default=0)
+        return w, h
+
+    def draw(self, dst, text, pos):
+        ''' Draw `text` onto `dst` with its top-left at `pos`. This returns
+            the rect that was drawn to.
+        '''
+        self._add_chars(text)
+        x, y = pos
+        h = 0
+        for ch in text:
+            rect = self.rects[ch]
+            dst.blit(self.sheet, (x, y), rect)
+            x += self.advances[ch]
+            h = max(h, rect.height)
+        return pygame.Rect(pos[0], y, x - pos[0], h)
+
+    def render(self, text):
+        ''' Return a new surface with `text` drawn on it. '''
+        surface = pygame.Surface(self.measure(text), pygame.SRCALPHA)
+        self.draw(surface, text, (0, 0))
+        return surface
+
 
 # ______________________________________________________________________
 # Public interface
@@ -25,6 +100,17 @@ def init():
     main_font = pygame.font.Font('dogicapixel.ttf', screen_scale(20))
     nice_font = pygame.font.Font('alagard.ttf', screen_scale(30))
 
+def get_atlas(font, color, antialias=False):
+    ''' Return the shared glyph atlas for this font, color, and antialias. '''
+    key = (font, tuple(color), antialias)
+    if key not in _atlases:
+        _atlases[key] = GlyphAtlas(font, color, antialias)
+    return _atlases[key]
+
+def measure(font, text):
+    ''' Return the (w, h) of `text` without drawing anything. '''
+    return get_atlas(font, (255, 255, 255)).measure(text)
+
 def make_text_surface(font, text, color=(255, 255, 255)):
-    ts = font.render(text, False, color)
+    ts = get_atlas(font, color).render(text)
     return ts, ts.get_width(), ts.get_height()
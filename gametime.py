@@ -0,0 +1,191 @@
+''' gametime.py
+
+    A single, pluggable clock that all game timing reads from.
+
+    Everything that needs the current time (anim, WordPaths, sprites) calls
+    gametime.get_ticks(), and the main loop calls gametime.tick() once per
+    frame. Which clock is behind those calls is chosen with set_clock():
+
+        RealTimeClock  -- pygame's own clock; the normal way to play.
+        FixedStepClock -- advances exactly one frame per tick and never waits;
+                          deterministic, and as fast as the CPU allows.
+        ScaledClock    -- real time sped up (or slowed down) by a factor,
+                          e.g. to run a simulation at 10x speed.
+
+    Passing `--time-scale=X` on the command line starts the game with a
+    ScaledClock, and `--fps=N` sets the frame rate passed to tick().
+
+    Gameplay doesn't depend on the frame rate. A FixedTimestep splits the
+    time between frames into fixed simulation steps, so the game plays at
+    the same speed whether it's drawn at 30, 60 or 144 frames per second.
+    When a frame falls too far behind, the FixedTimestep drops the extra
+    time with drop_time(), and get_ticks() lags the clock by that much from
+    then on, so timers, animations and gameplay all slow down together.
+'''
+
+
+# ______________________________________________________________________
+# Imports
+
+import math
+
+import pygame
+
+import cmdline
+
+
+# ______________________________________________________________________
+# Clock classes
+
+class RealTimeClock:
+    ''' Wall-clock time, throttled to the requested frame rate. '''
+
+    # How fast game time runs compared to real time; FixedTimestep uses this
+    # to size its catch-up limit. None means time is virtual, so the game
+    # never falls behind it.
+    scale = 1
+
+    def __init__(self):
+        self._clock = pygame.time.Clock()
+
+    def get_ticks(self):
+        return pygame.time.get_ticks()
+
+    def tick(self, fps):
+        self._clock.tick(fps)
+
+class FixedStepClock:
+    ''' Virtual time that moves forward by a fixed step on every tick.
+
+        If `step_ms` is None, each tick advances by 1 / fps seconds. The clock
+        never sleeps, so frames run back-to-back.
+    '''
+
+    scale = None
+
+    def __init__(self, step_ms=None, start_ms=0):
+        self.step_ms = step_ms
+        self.now_ms = start_ms
+
+    def get_ticks(self):
+        return self.now_ms
+
+    def tick(self, fps):
+        self.now_ms += self.step_ms if self.step_ms else 1000 / fps
+
+class ScaledClock:
+    ''' Real time multiplied by `scale`, measured from when the clock was
+        created. With scale=10 and 60 real frames per second, each frame moves
+        the game forward by 1/6 of a second.
+    '''
+
+    def __init__(self, scale):
+        self.scale = scale
+        self._clock = pygame.time.Clock()
+        self._start = pygame.time.get_ticks()
+
+    def get_ticks(self):
+        return (pygame.time.get_ticks() - self._start) * self.scale
+
+    def tick(self, fps):
+        self._clock.tick(fps)
+
+
+class FixedTimestep:
+    ''' Splits the time between frames into whole steps of `step_ms`, for a
+        simulation that always advances in steps of that size. Whatever time
+        is left over carries into the next frame.
+
+        If a frame needs more than `max_steps` steps (say the machine can't
+        keep up), the extra time is dropped with drop_time(), so all game
+        time slows down together rather than the game spending ever longer
+        catching up. `max_steps` is for a clock running at real-time speed;
+        it's multiplied by the clock's scale, and there's no limit at all
+        for a virtual clock such as FixedStepClock.
+    '''
+
+    def __init__(self, step_ms, max_steps, start_ms=0):
+        self.step_ms = step_ms
+        self.max_steps = max_steps
+        self.sim_ms = start_ms  # The game time as of the latest step.
+
+        # How far the frame time is past sim_ms, as a fraction of a step.
+        # Draw moving things this far from their previous step's position
+        # to their latest one.
+        self.alpha = 0.0
+
+        self.num_steps = 0
+        self.dropped_ms = 0
+
+    def _get_max_steps(self):
+        ''' Return this frame's step limit, or None for no limit. '''
+        scale = get_clock().scale
+        if scale is None:
+            return None
+        return max(self.max_steps, math.ceil(self.max_steps * scale))
+
+    def steps(self, now_ms):
+        ''' Yield once for each step needed to catch up to `now_ms`, which
+            should come from get_ticks(), first moving sim_ms forward to the
+            time of that step.
+        '''
+        # The small epsilon absorbs rounding when steps line up with frames.
+        n = int((now_ms - self.sim_ms) / self.step_ms + 1e-6)
+        max_steps = self._get_max_steps()
+        if max_steps is not None and n > max_steps:
+            extra_ms = (n - max_steps) * self.step_ms
+            drop_time(extra_ms)
+            self.dropped_ms += extra_ms
+            now_ms -= extra_ms
+            n = max_steps
+        leftover = now_ms - (self.sim_ms + n * self.step_ms)
+        self.alpha = min(1.0, max(0.0, leftover / self.step_ms))
+        for _ in range(n):
+            self.sim_ms += self.step_ms
+            self.num_steps += 1
+            yield self.sim_ms
+
+
+# ______________________________________________________________________
+# Globals and constants
+
+clock = None
+
+# Time taken out of the game by drop_time(); get_ticks() is this far behind
+# the clock.
+dropped_ms = 0
+
+
+# ______________________________________________________________________
+# Public interface
+
+# The frame rate set with --fps, or None to use the caller's default.
+fps_arg = cmdline.get_arg('fps', convert=float)
+
+def set_clock(new_clock):
+    ''' Make `new_clock` the clock that all game timing reads from. '''
+    global clock
+    clock = new_clock
+
+def get_clock():
+    ''' Return the current clock, creating the default one if needed. '''
+    if clock is None:
+        scale = cmdline.get_arg('time-scale', convert=float)
+        set_clock(RealTimeClock() if scale is None else ScaledClock(scale))
+    return clock
+
+def get_ticks():
+    ''' Return the current game time in milliseconds. '''
+    return (clock or get_clock()).get_ticks() - dropped_ms
+
+def drop_time(ms):
+    ''' Skip `ms` of clock time, so that game time falls that much further
+        behind the clock. Everything that reads get_ticks() sees the same
+        slowdown.
+    '''
+    global dropped_ms
+    dropped_ms += ms
+
+def tick(fps):
+    ''' Advance to the next frame of a game running at `fps` frames/sec. '''
+    (clock or get_clock()).tick(fps)
@@ -0,0 +1,111 @@
+''' hud.py
+
+    The heads-up display: the score and other small overlays.
+
+    Each widget keeps its rendered surface and only renders again when its
+    value changes, so drawing the HUD on a typical frame is just a few blits.
+    Pass --show-fps on the command line to add a frames-per-second counter.
+'''
+
+
+# ______________________________________________________________________
+# Imports
+
+import sys
+import time
+
+
+# ______________________________________________________________________
+# Globals and constants
+
+show_fps = ('--show-fps' in sys.argv)
+
+
+# ______________________________________________________________________
+# Widget classes
+
+class Widget:
+    def __init__(self, atlas, fmt, pos, align='left'):
+        ''' `fmt` is a format string applied to the value, as in
+            fmt.format(value). `pos` is the top-left corner if `align` is
+            'left', or the top-right corner if it's 'right'.
+        '''
+        self.atlas = atlas
+        self.fmt = fmt
+        self.pos = pos
+        self.align = align
+
+        self.value = None
+        self.surface = None
+        self.num_renders = 0
+
+    def tick(self):
+        ''' Called once per frame, before draw(). Widgets whose value
+            changes with time, rather than through set_value(), override this.
+        '''
+        pass
+
+    def set_value(self, value):
+        if value != self.value:
+            self.value = value
+            self.surface = None
+
+    def get_surface(self):
+        if self.surface is None:
+            self.surface = self.atlas.render(self.fmt.format(self.value))
+            self.num_renders += 1
+        return self.surface
+
+    def draw(self, renderer):
+        surface = self.get_surface()
+        x, y = self.pos
+        if self.align == 'right':
+            x -= surface.get_width()
+        renderer.blit(surface, (x, y))
+
+class FPSWidget(Widget):
+    ''' A frames-per-second counter, measured in real time. The displayed
+        value is updated every `update_period` seconds.
+    '''
+
+    update_period = 0.5
+
+    def __init__(self, atlas, pos, align='left'):
+        super().__init__(atlas, 'FPS: {}', pos, align)
+        self._num_frames = 0
+        self._period_start = time.perf_counter()
+
+    def tick(self):
+        self._num_frames += 1
+        now = time.perf_counter()
+        elapsed = now - self._period_start
+        if elapsed >= self.update_period:
+            self.set_value(round(self._num_frames / elapsed))
+            self._num_frames = 0
+            self._period_start = now
+
+
+# ______________________________________________________________________
+# The HUD
+
+class HUD:
+    def __init__(self):
+        self.widgets = {}  # Maps name -> Widget, in drawing order.
+
+    def add(self, name, widget):
+        self.widgets[name] = widget
+        return widget
+
+    def set(self, name, value):
+        self.widgets[name].set_value(value)
+
+    def draw(self, renderer):
+        for widget in self.widgets.values():
+            widget.tick()
+            widget.draw(renderer)
+
+    def print_stats(self):
+        print('HUD renders:' + ''.join(
+            f'  {name} {widget.num_renders}'
+            for name, widget in self.widgets.items()
+        ))
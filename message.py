@@ -21,7 +21,9 @@ class Message(pygame.sprite.Sprite):
 
         color = (50, 30, 10)
 
-        msg_box = NineSlice('message_box_1.png', (54, 41), (61, 48), scale_by)
+        msg_box = NineSlice.get(
+                'message_box_1.png', (54, 41), (61, 48), scale_by
+        )
         text_srf, text_w, text_h = fonts.make_text_surface(
                 fonts.main_font, text, color
         )
@@ -1,18 +1,41 @@
+from collections import OrderedDict
+
 import pygame
 
+import assets
+
 class NineSlice:
+
+    # Shared instances, keyed by (image_filename, top_left, bottom_right,
+    # scale_by); see NineSlice.get().
+    _instances = {}
+
+    # How many rendered sizes each instance keeps around.
+    max_cached_renders = 64
+
+    @classmethod
+    def get(cls, image_filename, top_left, bottom_right, scale_by=1):
+        """
+        Returns a shared NineSlice for these arguments, creating it only the
+        first time it's asked for. Prefer this to the constructor so that each
+        image is loaded, scaled, and sliced just once.
+        """
+        key = (image_filename, tuple(top_left), tuple(bottom_right), scale_by)
+        if key not in cls._instances:
+            cls._instances[key] = cls(*key)
+        return cls._instances[key]
+
     def __init__(self, image_filename, top_left, bottom_right, scale_by=1):
         """
         Initializes the NineSlice object.
-        
+
         Args:
             image_filename (str): Path to the 9-slice image file.
             top_left (tuple): (w, h) of the top-left fixed-size corner.
             bottom_right (tuple): (w, h) of the bottom-right fixed-size corner.
         """
         # Load image with alpha support
-        self.image = pygame.image.load(image_filename).convert_alpha()
-        self.image = pygame.transform.scale_by(self.image, scale_by)
+        self.image = assets.load_image(image_filename, scale_by)
 
         self.image_width = self.image.get_width()
         self.image_height = self.image.get_height()
@@ -32,41 +55,87 @@ class NineSlice:
         self.minwidth  = self.image_width
         self.minheight = self.image_height
 
-    def draw(self, surface, x, y, width, height):
+        self._cut_slices()
+
+        # Rendered surfaces, keyed by (width, height), least recent first.
+        self._renders = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _cut_slices(self):
         """
-        Draws the 9-slice scaled image on the given surface.
-        
-        Args:
-            surface (pygame.Surface): The surface to draw on.
-            x (int): X-coordinate for the top-left corner.
-            y (int): Y-coordinate for the top-left corner.
-            width (int): Target width of the rendered image.
-            height (int): Target height of the rendered image.
+        Cuts the image into its nine regions. These are subsurfaces, so this
+        is cheap, but there's no need to do it more than once.
         """
-        dst_w  = max(width , self.minwidth)
-        dst_h = max(height, self.minheight)
-
         # Define some shorthands to keep the code below more compact.
         ell, r = self.left, self.right
         t, b   = self.top,  self.bottom
         w, h   = self.image_width, self.image_height
 
         # Define regions of the original image
-        corners = {
+        self.corners = {
             "top_left":     self.image.subsurface((0,     0,     ell, t)),
             "top_right":    self.image.subsurface((w - r, 0,     r,   t)),
             "bottom_left":  self.image.subsurface((0,     h - b, ell, b)),
             "bottom_right": self.image.subsurface((w - r, h - b, r,   b))
         }
 
-        edges = {
+        self.edges = {
             "top":    self.image.subsurface((ell,   0,     w - ell - r, t)),
             "bottom": self.image.subsurface((ell,   h - b, w - ell - r, b)),
             "left":   self.image.subsurface((0,     t,     ell, h - t - b)),
             "right":  self.image.subsurface((w - r, t,     r,   h - t - b)),
         }
 
-        center = self.image.subsurface((ell, t, w - ell - r, h - t - b))
+        self.center = self.image.subsurface((ell, t, w - ell - r, h - t - b))
+
+    def render(self, width, height):
+        """
+        Returns a surface holding the 9-slice image scaled to the given size
+        (or to the minimum size, if that's larger). Results are kept in a
+        small LRU cache, so treat the returned surface as read-only; copy it
+        if you want to draw on it.
+        """
+        size = (max(width, self.minwidth), max(height, self.minheight))
+        rendered = self._renders.get(size)
+        if rendered is not None:
+            self._renders.move_to_end(size)
+            self.cache_hits += 1
+            return rendered
+
+        self.cache_misses += 1
+        rendered = pygame.Surface(size, pygame.SRCALPHA)
+        self._draw_slices(rendered, 0, 0, *size)
+        self._renders[size] = rendered
+        if len(self._renders) > self.max_cached_renders:
+            self._renders.popitem(last=False)
+        return rendered
+
+    @classmethod
+    def print_stats(cls):
+        hits   = sum(inst.cache_hits   for inst in cls._instances.values())
+        misses = sum(inst.cache_misses for inst in cls._instances.values())
+        print(f'NineSlice renders: {len(cls._instances)} instances,'
+              f' {hits} hits, {misses} misses')
+
+    def draw(self, surface, x, y, width, height):
+        """
+        Draws the 9-slice scaled image on the given surface.
+
+        Args:
+            surface (pygame.Surface): The surface to draw on.
+            x (int): X-coordinate for the top-left corner.
+            y (int): Y-coordinate for the top-left corner.
+            width (int): Target width of the rendered image.
+            height (int): Target height of the rendered image.
+        """
+        surface.blit(self.render(width, height), (x, y))
+
+    def _draw_slices(self, surface, x, y, dst_w, dst_h):
+        # Define some shorthands to keep the code below more compact.
+        ell, r = self.left, self.right
+        t, b   = self.top,  self.bottom
+        corners, edges = self.corners, self.edges
 
         # Calculate scaled sizes
         scaled_parts = {
@@ -87,7 +156,7 @@ class NineSlice:
                 (r, dst_h - t - b)
             ),
             "center": pygame.transform.scale(
-                center,
+                self.center,
                 (dst_w - ell - r, dst_h - t - b)
             ),
         }
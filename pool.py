@@ -0,0 +1,107 @@
+''' pool.py
+
+    Fixed-size pools of sprites that are reused instead of reallocated.
+
+    A pool creates all of its sprites up front. spawn() takes a free sprite,
+    resets it, and adds it to the pool's groups; when that sprite is killed
+    (by itself, or by a collision with dokill set), it goes back to the pool.
+    If every sprite is in use, spawn() either recycles the oldest live one or
+    returns None, depending on how the pool was set up.
+'''
+
+
+# ______________________________________________________________________
+# Imports
+
+from collections import OrderedDict
+
+import pygame
+
+
+# ______________________________________________________________________
+# Classes
+
+class PooledSprite(pygame.sprite.Sprite):
+    ''' A sprite that returns to its pool when it's killed. Subclasses
+        implement reset(*args) to prepare the sprite for another use.
+    '''
+
+    pool = None
+
+    def reset(self, *args):
+        pass
+
+    def kill(self):
+        super().kill()
+        if self.pool is not None:
+            self.pool._release(self)
+
+class SpritePool:
+    def __init__(self, make_sprite, capacity, groups=(), recycle_oldest=True):
+        ''' `make_sprite()` returns a new PooledSprite; it's called
+            `capacity` times now, and never again. Spawned sprites are added
+            to each group in `groups`.
+        '''
+        self.capacity = capacity
+        self.groups = groups
+        self.recycle_oldest = recycle_oldest
+
+        self._free = []
+        self._live = OrderedDict()  # An ordered set, oldest first.
+        for _ in range(capacity):
+            sprite = make_sprite()
+            sprite.pool = self
+            self._free.append(sprite)
+        self._free.reverse()  # So sprites are handed out in creation order.
+
+        # Counters to show how the pool is being used.
+        self.num_spawned  = 0
+        self.num_recycled = 0
+        self.num_refused  = 0
+
+    def spawn(self, *args):
+        ''' Return a live sprite reset with `args`, or None if the pool is
+            full and doesn't recycle.
+        '''
+        if not self._free:
+            if not self.recycle_oldest or not self._live:
+                self.num_refused += 1
+                return None
+            oldest = next(iter(self._live))
+            oldest.kill()
+            self.num_recycled += 1
+        sprite = self._free.pop()
+        self._on_spawn(sprite, *args)
+        self._live[sprite] = None
+        sprite.add(*self.groups)
+        self.num_spawned += 1
+        return sprite
+
+    def _on_spawn(self, sprite, *args):
+        ''' Prepare `sprite` to go live; subclasses can override this. '''
+        sprite.reset(*args)
+
+    def _on_release(self, sprite):
+        ''' Called when a live `sprite` is killed; subclasses can override
+            this.
+        '''
+        pass
+
+    def _release(self, sprite):
+        if sprite in self._live:
+            del self._live[sprite]
+            self._free.append(sprite)
+            self._on_release(sprite)
+
+    @property
+    def num_live(self):
+        return len(self._live)
+
+    @property
+    def num_free(self):
+        return len(self._free)
+
+    def get_stats(self):
+        return (f'{self.num_live} live, {self.num_free} pooled,'
+                f' {self.num_spawned} spawned, {self.num_recycled} recycled,'
+                f' {self.num_refused} refused')
@@ -0,0 +1,71 @@
+''' prefetch.py
+
+    Run a slow job a little at a time, spread over many frames.
+
+    A job is a generator function that yields whenever it's at a good place
+    to pause, and returns its result. Each frame, the main loop calls
+    run(budget_ms), which resumes the job until it finishes or that frame's
+    budget is spent. When the result is needed, finish() runs whatever is
+    left all at once and returns it.
+
+    The jobs here build pygame surfaces, which isn't safe to do from another
+    thread, so this runs them on the main thread between frames instead.
+'''
+
+
+# ______________________________________________________________________
+# Imports
+
+import time
+
+
+# ______________________________________________________________________
+# Classes
+
+class Prefetcher:
+    def __init__(self, job):
+        ''' `job` is a generator, as returned by calling a generator
+            function.
+        '''
+        self._job = job
+        self.is_done = False
+        self.result = None
+
+        # Counters to show how the work was spread out.
+        self.num_steps = 0
+        self.num_frames = 0
+        self.num_finish_steps = 0  # Steps left over for finish() to run.
+
+    def _step(self):
+        ''' Run the job to its next yield; return False if it finished. '''
+        try:
+            next(self._job)
+        except StopIteration as stop:
+            self.is_done = True
+            self.result = stop.value
+            return False
+        self.num_steps += 1
+        return True
+
+    def run(self, budget_ms):
+        ''' Resume the job until it's done or `budget_ms` has passed. A step
+            that's already started always runs to its next yield, so keep
+            each one shorter than the budget.
+        '''
+        if self.is_done:
+            return
+        self.num_frames += 1
+        deadline = time.perf_counter() + budget_ms / 1000
+        while not self.is_done and time.perf_counter() < deadline:
+            self._step()
+
+    def finish(self):
+        ''' Run the rest of the job now, and return its result. '''
+        while not self.is_done:
+            if self._step():
+                self.num_finish_steps += 1
+        return self.result
+
+    def get_stats(self):
+        return (f'{self.num_steps} steps over {self.num_frames} frames,'
+                f' {self.num_finish_steps} left for finish()')
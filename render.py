@@ -0,0 +1,214 @@
+''' render.py
+
+    Renderers that draw a frame to the screen.
+
+    The static parts of the screen (the background and the poem panel) are
+    composited into a StaticLayer, an opaque, display-format surface that is
+    only redrawn when the poem changes or a new quatrain starts. Call the
+    renderer's invalidate() whenever that happens.
+
+    Both renderers have the same interface. Each frame, call begin_frame(),
+    then draw_group() and blit() for everything that moves or changes, then
+    end_frame().
+
+    FullFrameRenderer copies the whole static layer to the screen, draws
+    everything else, and flips the whole display.
+
+    DirtyRectRenderer only restores the static layer under what was drawn on
+    the previous frame, and only sends the changed regions to the display.
+    Pass --dirty-rects on the command line to use it.
+
+    Sprites that move in fixed simulation steps can be drawn in between
+    their last two positions with the interpolated() context manager.
+'''
+
+
+# ______________________________________________________________________
+# Imports
+
+import sys
+from contextlib import contextmanager
+
+import pygame
+
+
+# ______________________________________________________________________
+# Globals and constants
+
+use_dirty_rects = ('--dirty-rects' in sys.argv)
+
+
+# ______________________________________________________________________
+# Static layer
+
+class StaticLayer:
+    def __init__(self, size, draw_layers):
+        ''' `draw_layers(surface)` draws the static content onto `surface`. '''
+        self.surface = pygame.Surface(size).convert()
+        self.draw_layers = draw_layers
+
+        self._stale_rects = []
+        self._is_all_stale = True
+
+        # Counters showing how often we actually redraw the layer.
+        self.num_full_rebuilds = 0
+        self.num_partial_rebuilds = 0
+
+    def invalidate(self, rect=None):
+        ''' Mark `rect`, or the whole layer if `rect` is None, as changed. '''
+        if rect is None:
+            self._is_all_stale = True
+        else:
+            self._stale_rects.append(pygame.Rect(rect))
+
+    def refresh(self):
+        ''' Redraw whatever parts of the layer are out of date. '''
+        if self._is_all_stale:
+            self.draw_layers(self.surface)
+            self.num_full_rebuilds += 1
+        else:
+            for rect in self._stale_rects:
+                self.surface.set_clip(rect)
+                self.draw_layers(self.surface)
+                self.num_partial_rebuilds += 1
+            self.surface.set_clip(None)
+        self._stale_rects = []
+        self._is_all_stale = False
+
+    def draw(self, screen, rect=None):
+        ''' Copy the layer to `screen`, either entirely or just in `rect`. '''
+        if self._is_all_stale or self._stale_rects:
+            self.refresh()
+        if rect is None:
+            screen.blit(self.surface, (0, 0))
+        else:
+            screen.blit(self.surface, rect, rect)
+
+
+# ______________________________________________________________________
+# Renderer classes
+
+class FullFrameRenderer:
+    def __init__(self, screen, static_layer):
+        self.screen = screen
+        self.static_layer = static_layer
+
+    def invalidate(self, rect=None):
+        ''' Mark the static content in `rect`, or everywhere if `rect` is
+            None, as changed.
+        '''
+        self.static_layer.invalidate(rect)
+
+    def begin_frame(self):
+        self.static_layer.draw(self.screen)
+
+    def draw_group(self, group):
+        group.draw(self.screen)
+
+    def blit(self, surface, pos):
+        self.screen.blit(surface, pos)
+
+    def end_frame(self):
+        pygame.display.flip()
+
+class DirtyRectRenderer:
+    def __init__(self, screen, static_layer):
+        self.screen = screen
+        self.static_layer = static_layer
+
+        # Rects drawn on the previous frame and on this frame.
+        self._prev_rects = []
+        self._rects = []
+
+        # Static regions that changed, and whether the whole screen did.
+        self._invalid_rects = []
+        self._is_all_invalid = True
+
+        # Counters to help see how much work we're saving.
+        self.num_rects_updated = 0
+        self.num_full_updates = 0
+
+    def invalidate(self, rect=None):
+        ''' Mark the static content in `rect`, or everywhere if `rect` is
+            None, as changed so it will be redrawn on the next frame.
+        '''
+        self.static_layer.invalidate(rect)
+        if rect is None:
+            self._is_all_invalid = True
+        else:
+            self._invalid_rects.append(pygame.Rect(rect))
+
+    def begin_frame(self):
+        if self._is_all_invalid:
+            self.static_layer.draw(self.screen)
+            return
+        # Erase last frame's moving parts, and redraw changed static regions.
+        for rect in self._prev_rects + self._invalid_rects:
+            self.static_layer.draw(self.screen, rect)
+
+    def draw_group(self, group):
+        # Group.draw() doesn't return the rects it drew, so we blit directly.
+        self._rects.extend(self.screen.blits(
+            [(sprite.image, sprite.rect) for sprite in group]
+        ))
+
+    def blit(self, surface, pos):
+        self._rects.append(self.screen.blit(surface, pos))
+
+    def end_frame(self):
+        if self._is_all_invalid:
+            pygame.display.flip()
+            self.num_full_updates += 1
+        else:
+            rects = self._prev_rects + self._invalid_rects + self._rects
+            pygame.display.update(rects)
+            self.num_rects_updated += len(rects)
+        self._prev_rects = self._rects
+        self._rects = []
+        self._invalid_rects = []
+        self._is_all_invalid = False
+
+
+# ______________________________________________________________________
+# Public interface
+
+def make_renderer(screen, draw_static_layers):
+    ''' Return the renderer selected on the command line. The static layer is
+        drawn by `draw_static_layers(surface)`.
+    '''
+    static_layer = StaticLayer(screen.get_size(), draw_static_layers)
+    cls = DirtyRectRenderer if use_dirty_rects else FullFrameRenderer
+    return cls(screen, static_layer)
+
+@contextmanager
+def interpolated(sprites, alpha):
+    ''' Within this context, each sprite's rect is moved a fraction `alpha`
+        of the way from its prev_rect to where it is now; the rects are put
+        back afterward. Sprites without a prev_rect aren't moved.
+    '''
+    moved = []
+    for sprite in sprites:
+        prev = getattr(sprite, 'prev_rect', None)
+        if prev is None:
+            continue
+        rect = sprite.rect
+        topleft = rect.topleft
+        if prev.topleft != topleft:
+            moved.append((rect, topleft))
+            rect.topleft = (
+                    round(prev.x + (rect.x - prev.x) * alpha),
+                    round(prev.y + (rect.y - prev.y) * alpha)
+            )
+    try:
+        yield
+    finally:
+        for rect, topleft in moved:
+            rect.topleft = topleft
+
+def print_stats(renderer):
+    layer = renderer.static_layer
+    print(f'Static layer: {layer.num_full_rebuilds} full rebuilds,'
+          f' {layer.num_partial_rebuilds} partial rebuilds')
+    if isinstance(renderer, DirtyRectRenderer):
+        print(f'Dirty rects: {renderer.num_rects_updated} rects updated,'
+              f' {renderer.num_full_updates} full-screen updates')